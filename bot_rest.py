@@ -3,8 +3,9 @@ import asyncio
 import logging
 import yaml
 import json
-from datetime import datetime
-from typing import Dict, Tuple
+import time
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Tuple
 from colorama import Fore, Style, init as colorama_init
 
 from exchanges.mexc_client import MEXCClient
@@ -14,6 +15,10 @@ from exchanges.gate_client import GateClient
 from exchanges.kucoin_client import KuCoinClient
 from exchanges.okx_client import OKXClient
 from exchanges.bingx_client import BingXClient
+from exchanges.base_exchange import fetch_all_exchanges
+from exchanges.aggregator import PriceTable, fetch_table
+from exchanges.http import close_session as close_shared_session
+from exchanges.ws_book_cache import WSBookCache
 
 from spread_detector import SpreadDetector, SpreadOpportunity
 from signal_generator import SmartSignalGenerator
@@ -21,6 +26,22 @@ from telegram_notifier import TelegramNotifier
 from funding_checker import FundingRateChecker
 
 
+@dataclass(frozen=True, slots=True)
+class SpreadCfg:
+    """Typed `spread` section of config.yaml, parsed once at startup."""
+    min_threshold: float
+    min_volume_usdt: float = 500_000
+    max_funding_rate: float = 0.5
+    min_change_percent: float = 5.0
+    min_cooldown_minutes: int = 3
+    max_cooldown_minutes: int = 30
+
+
+def _norm(exchange: str) -> str:
+    """Normalize exchange name for client lookup."""
+    return exchange.strip().lower()
+
+
 class SpreadMonitor:
     """Spread monitor with funding rate filter."""
     
@@ -30,33 +51,53 @@ class SpreadMonitor:
         self.logger = logging.getLogger("Monitor")
         
         self.config = self._load_config(config_path)
+        self.spread_cfg = self._spread_cfg(self.config['spread'])
         
-        # Clients
-        self.mexc = MEXCClient()
-        self.binance = BinanceClient()
+        # Clients (full-ticker snapshots are reused within their TTL)
+        main_ttl = self._ticker_ttl('ticker_cache_seconds', 2.0)
+        other_ttl = self._ticker_ttl('other_ticker_cache_seconds', 2.0)
+        self.mexc = MEXCClient(cache_ttl=main_ttl)
+        self.binance = BinanceClient(cache_ttl=main_ttl)
         self.other = {
-            "Bybit": BybitClient(),
-            "Gate": GateClient(),
-            "KuCoin": KuCoinClient(),
-            "OKX": OKXClient(),
-            "BingX": BingXClient()
+            "Bybit": BybitClient(cache_ttl=other_ttl),
+            "Gate": GateClient(cache_ttl=other_ttl),
+            "KuCoin": KuCoinClient(cache_ttl=other_ttl),
+            "OKX": OKXClient(cache_ttl=other_ttl),
+            "BingX": BingXClient(cache_ttl=other_ttl)
         }
+        self.clients = {"MEXC": self.mexc, "Binance": self.binance, **self.other}
+        
+        # Slow exchanges are dropped from a scan instead of stalling it
+        self.per_exchange_timeout_s = self.config['monitoring'].get('per_exchange_timeout_seconds', 2.0)
+        self.exchange_timeouts = {name: 0 for name in self.clients}
+        self._client_by_name = {_norm(name): c for name, c in self.clients.items()}
+        
+        # Live best bid/ask from WebSocket streams (REST snapshots as fallback)
+        self.ws_books = None
+        if self.config['monitoring'].get('websocket_books', True):
+            self.ws_books = WSBookCache(
+                max_age_seconds=self.config['monitoring'].get('ws_max_age_seconds', 2.0)
+            )
+        self._ws_task = None
+        self._commands_task = None
         
         # Detector
         self.detector = SpreadDetector(
-            min_spread_percent=self.config['spread']['min_threshold'],
-            min_volume_usdt=self.config['spread'].get('min_volume_usdt', 500_000),
+            min_spread_percent=self.spread_cfg.min_threshold,
+            min_volume_usdt=self.spread_cfg.min_volume_usdt,
         )
         
         # Funding rate checker
-        max_funding = self.config['spread'].get('max_funding_rate', 0.5)
-        self.funding = FundingRateChecker(max_funding_rate=max_funding)
+        self.funding = FundingRateChecker(
+            max_funding_rate=self.spread_cfg.max_funding_rate,
+            refresh_seconds=self.config['monitoring'].get('funding_refresh_seconds', 300)
+        )
         
         # Smart cooldown
         self.signals = SmartSignalGenerator(
-            min_spread_change_percent=self.config['spread'].get('min_change_percent', 5.0),
-            min_cooldown_minutes=self.config['spread'].get('min_cooldown_minutes', 3),
-            max_cooldown_minutes=self.config['spread'].get('max_cooldown_minutes', 30)
+            min_spread_change_percent=self.spread_cfg.min_change_percent,
+            min_cooldown_minutes=self.spread_cfg.min_cooldown_minutes,
+            max_cooldown_minutes=self.spread_cfg.max_cooldown_minutes
         )
         
         # Telegram with topic support
@@ -71,6 +112,16 @@ class SpreadMonitor:
         self.alerts_sent = 0
         self.funding_rejected = 0
         
+        # Adaptive scan interval: back off while the market is quiet
+        self.last_opps_found = 0
+        self._idle_streak = 0
+        
+        # Limit in-flight order book validations (exchange rate limits)
+        self.validation_sem = asyncio.Semaphore(20)
+        
+        # Best bid/ask snapshots per exchange, refreshed once per scan
+        self._book_cache: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        
         self.blacklist = self._load_blacklist()
         self.last_update_id = 0
     
@@ -85,9 +136,22 @@ class SpreadMonitor:
         with open("blacklist.json", "w") as f:
             json.dump(self.blacklist, f)
 
-    async def process_commands(self):
+    async def _command_loop(self):
+        """Long-poll Telegram commands in the background, independent of the scan loop."""
+        while self.running:
+            start = time.monotonic()
+            try:
+                handled = await self.process_commands()
+            except Exception as e:
+                self.logger.error(f"Command error: {e}")
+                handled = 0
+            # Пустой ответ раньше таймаута = ошибка сети/API, не долбим API в цикле
+            if not handled and time.monotonic() - start < 1:
+                await asyncio.sleep(5)
+    
+    async def process_commands(self) -> int:
         """Check for telegram commands."""
-        updates = self.telegram.get_updates(offset=self.last_update_id + 1)
+        updates = await self.telegram.get_updates(offset=self.last_update_id + 1)
         for u in updates:
             self.last_update_id = u["update_id"]
             if "message" not in u:
@@ -107,12 +171,13 @@ class SpreadMonitor:
                     if symbol not in self.blacklist:
                         self.blacklist.append(symbol)
                         self._save_blacklist()
-                        self.telegram.send_message(f"Added {symbol} to blacklist.", chat_id=chat_id)
+                        await self.telegram.send_message(f"Added {symbol} to blacklist.", chat_id=chat_id)
                         self.logger.info(f"Blacklisted: {symbol}")
                     else:
-                        self.telegram.send_message(f"{symbol} is already blacklisted.", chat_id=chat_id)
+                        await self.telegram.send_message(f"{symbol} is already blacklisted.", chat_id=chat_id)
                 else:
-                    self.telegram.send_message("Usage: /blacklist SYMBOL", chat_id=chat_id)
+                    await self.telegram.send_message("Usage: /blacklist SYMBOL", chat_id=chat_id)
+        return len(updates)
     
     def _setup_logging(self):
         logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -128,9 +193,9 @@ class SpreadMonitor:
         with open(path, 'r', encoding='utf-8') as f:
             return yaml.safe_load(f)
     
-    async def fetch_prices(self) -> Tuple[Dict, Dict]:
-        """Fetch all prices."""
-        start = datetime.now()
+    async def fetch_prices(self) -> PriceTable:
+        """Fetch all prices into one cross-exchange table (MEXC row first)."""
+        start = time.monotonic()
         
         tasks = {
             "MEXC": self.mexc.get_all_tickers_with_volume(),
@@ -139,64 +204,72 @@ class SpreadMonitor:
         for name, client in self.other.items():
             tasks[name] = client.get_all_tickers()
         
-        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
-        results_dict = dict(zip(tasks.keys(), results))
-        
-        mexc_data = results_dict.get("MEXC", {})
-        if isinstance(mexc_data, Exception):
-            mexc_data = {}
+        # MEXC/Binance return snapshots with volume; other exchanges are price-only
+        table, results = await fetch_table(tasks, timeout=self.per_exchange_timeout_s)
         
-        binance_data = results_dict.get("Binance", {})
-        if isinstance(binance_data, Exception):
-            binance_data = {}
+        for name, raw in results.items():
+            if isinstance(raw, asyncio.TimeoutError):
+                self.exchange_timeouts[name] += 1
         
-        other_data = {"Binance": binance_data}
-        for name in self.other.keys():
-            raw = results_dict.get(name, {})
-            if isinstance(raw, Exception):
-                other_data[name] = {}
-            else:
-                other_data[name] = {s: (p, 1e9) for s, p in raw.items()}
+        elapsed = time.monotonic() - start
+        self.logger.info(f"Prices: MEXC:{table.count('MEXC')} Binance:{table.count('Binance')} [{elapsed:.1f}s]")
         
-        elapsed = (datetime.now() - start).total_seconds()
-        self.logger.info(f"Prices: MEXC:{len(mexc_data)} Binance:{len(binance_data)} [{elapsed:.1f}s]")
+        return table
+    
+    async def fetch_books(self, exchanges: set) -> Dict[str, Dict[str, Tuple[float, float]]]:
+        """Fetch best bid/ask for all symbols, one request per exchange."""
+        names = [
+            name for name in self.clients
+            if (name == "MEXC" or name in exchanges)
+            and not (self.ws_books and self.ws_books.is_live(name))
+        ]
         
-        return mexc_data, other_data
+        results = await fetch_all_exchanges(
+            {name: self.clients[name].get_all_orderbook_tickers() for name in names}
+        )
+        return {
+            name: ({} if isinstance(books, Exception) else books)
+            for name, books in results.items()
+        }
+    
+    async def _get_book(self, client, symbol: str) -> Optional[Tuple[float, float]]:
+        """Best bid/ask from WS cache or scan snapshot, per-symbol request as fallback."""
+        book = self.ws_books and self.ws_books.get(client.name, symbol)
+        if book:
+            return book
+        book = self._book_cache.get(client.name, {}).get(symbol)
+        if book:
+            return book
+        return await (await client.enqueue_orderbook(symbol))
     
     async def validate_opportunity(self, opp: SpreadOpportunity) -> bool:
         """
         Validate opportunity using real order book data (Bids/Asks).
         Returns True if valid, and updates opp.spread_percent with real spread.
         """
-        try:
-            # 1. Get MEXC Orderbook
-            mexc_ob = await self.mexc.get_orderbook_ticker(opp.symbol)
-            if not mexc_ob:
-                self.logger.debug(f"{opp.symbol}: No MEXC orderbook")
-                return False
-            mexc_bid, mexc_ask = mexc_ob
+        async with self.validation_sem:
+            return await self._validate_opportunity(opp)
 
-            # 2. Get Other Orderbook
-            # Special case for Binance as it is stored separately
-            if "Binance" in opp.other_exchange:
-                other_client = self.binance
-            else:
-                other_client = self.other.get(opp.other_exchange.split()[0]) # Fix potential naming issues
-                if not other_client:
-                    # Fallback purely on name
-                    for name, client in self.other.items():
-                        if name in opp.other_exchange:
-                            other_client = client
-                            break
-            
+    async def _validate_opportunity(self, opp: SpreadOpportunity) -> bool:
+        try:
+            # 1. Resolve other exchange client (detector uses canonical names)
+            other_client = self._client_by_name.get(_norm(opp.other_exchange))
             if not other_client:
                  self.logger.error(f"Client not found for {opp.other_exchange}")
                  return False
 
-            other_ob = await other_client.get_orderbook_ticker(opp.symbol)
+            # 2. Get both orderbooks (snapshot lookup, concurrent fallback)
+            mexc_ob, other_ob = await asyncio.gather(
+                self._get_book(self.mexc, opp.symbol),
+                self._get_book(other_client, opp.symbol)
+            )
+            if not mexc_ob:
+                self.logger.debug(f"{opp.symbol}: No MEXC orderbook")
+                return False
             if not other_ob:
                 self.logger.debug(f"{opp.symbol}: No {opp.other_exchange} orderbook")
                 return False
+            mexc_bid, mexc_ask = mexc_ob
             other_bid, other_ask = other_ob
 
             # 3. Check Internal Spread (Liquidity Health)
@@ -236,7 +309,7 @@ class SpreadMonitor:
             opp.other_price = other_bid if opp.signal == "MEXC_LONG" else other_ask
             
             # Check if still profitable
-            if real_spread < self.config['spread']['min_threshold']:
+            if real_spread < self.spread_cfg.min_threshold:
                 self.logger.debug(f"{opp.symbol}: Spread dropped {old_spread:.1f}% -> {real_spread:.1f}% after OB check")
                 return False
                 
@@ -246,49 +319,65 @@ class SpreadMonitor:
             self.logger.error(f"Validation error {opp.symbol}: {e}")
             return False
 
+    def _check_funding(self, opp: SpreadOpportunity) -> bool:
+        """Funding rate filter; counts and logs rejections."""
+        funding_ok, funding_reason = self.funding.is_funding_ok(
+            opp.symbol, opp.signal, opp.other_exchange
+        )
+        if not funding_ok:
+            self.funding_rejected += 1
+            self.logger.info(f"REJECTED {opp.symbol}: {funding_reason}")
+        return funding_ok
+    
     async def scan_and_send(self):
         """Scan and send signals with funding filter."""
         self.scan_count += 1
+        self.last_opps_found = 0
         
         try:
-            # Refresh funding rates every scan
-            await self.funding.refresh_all()
-            
-            # Fetch prices
-            mexc_data, other_data = await self.fetch_prices()
-            
-            if not mexc_data:
+            # Fetch prices and refresh stale funding rates concurrently
+            prices, *funding = await asyncio.gather(
+                self.fetch_prices(),
+                *self.funding.refresh_tasks(),
+                return_exceptions=True
+            )
+            if funding:
+                self.funding.finish_refresh(funding)
+            if isinstance(prices, Exception):
+                raise prices
+            if not prices.count("MEXC"):
                 return
             
             # Detect opportunities
-            opps = self.detector.detect(mexc_data, other_data)
+            opps = self.detector.detect(prices)
+            self.last_opps_found = len(opps)
             
             if not opps:
                 self.logger.info("No spreads found")
                 return
             
-            # Process each opportunity
-            for opp in opps:
-                if opp.symbol in self.blacklist:
-                    continue
-                
-                # 0. Validate with Order Book (Quality Check)
-                is_valid = await self.validate_opportunity(opp)
-                if not is_valid:
-                    continue
-
-                # 1. Check funding rate
-                funding_ok, funding_reason = self.funding.is_funding_ok(
-                    opp.symbol, opp.signal, opp.other_exchange
+            # 1. Cheap in-memory filters first (no HTTP)
+            candidates = [opp for opp in opps if opp.symbol not in self.blacklist]
+            candidates = [opp for opp in candidates if self._check_funding(opp)]
+            now = time.monotonic()
+            candidates = [opp for opp in candidates if not self.signals.in_min_cooldown(opp, now)]
+            
+            # 2. Validate survivors with Order Book (Quality Check) - concurrently
+            if candidates:
+                self._book_cache = await self.fetch_books(
+                    {opp.other_exchange for opp in candidates}
                 )
-                
-                if not funding_ok:
-                    self.funding_rejected += 1
-                    self.logger.info(f"REJECTED {opp.symbol}: {funding_reason}")
-                    continue
-                
-                # 2. Check cooldown
-                should, reason = self.signals.should_notify(opp)
+            results = await asyncio.gather(
+                *(self.validate_opportunity(opp) for opp in candidates),
+                return_exceptions=True
+            )
+            valid = [opp for opp, ok in zip(candidates, results) if ok is True]
+            
+            # 3. Smart cooldown on the real (order book) spread, then send in one batch
+            batch = []
+            now = time.monotonic()
+            for opp in valid:
+                should, reason = self.signals.should_notify(opp, now=now)
                 
                 if should:
                     vol_m = opp.min_volume / 1e6
@@ -302,13 +391,12 @@ class SpreadMonitor:
                         f"FR:{mexc_fr:.3f}%/{binance_fr:.3f}%"
                     )
                     
-                    success = await self.telegram.send_notification_with_funding(
-                        opp, reason, mexc_fr, binance_fr
-                    )
-                    if success:
-                        self.alerts_sent += 1
+                    batch.append((opp, reason, mexc_fr, binance_fr))
                 else:
                     self.signals.update_spread_without_notify(opp)
+            
+            if batch:
+                self.alerts_sent += await self.telegram.send_batch(batch)
                     
         except Exception as e:
             self.logger.error(f"Error: {e}")
@@ -316,11 +404,64 @@ class SpreadMonitor:
             traceback.print_exc()
 
     async def cleanup(self):
-        await self.mexc.close_session()
-        await self.binance.close_session()
-        await self.funding.close_session()
-        for c in self.other.values():
-            await c.close_session()
+        if self._commands_task:
+            self._commands_task.cancel()
+            await asyncio.gather(self._commands_task, return_exceptions=True)
+        if self._ws_task:
+            self._ws_task.cancel()
+            await asyncio.gather(self._ws_task, return_exceptions=True)
+        await asyncio.gather(
+            self.mexc.close_session(),
+            self.binance.close_session(),
+            self.funding.close_session(),
+            *(c.close_session() for c in self.other.values()),
+            return_exceptions=True
+        )
+        await close_shared_session()
+    
+    def _spread_cfg(self, spread: dict) -> SpreadCfg:
+        """Build SpreadCfg from the 'spread' section, ignoring unknown keys."""
+        known = {f.name for f in fields(SpreadCfg)}
+        unknown = sorted(spread.keys() - known)
+        if unknown:
+            self.logger.warning(f"Unknown spread config keys ignored: {', '.join(unknown)}")
+        return SpreadCfg(**{k: v for k, v in spread.items() if k in known})
+    
+    def _ticker_ttl(self, key: str, default: float) -> float:
+        """
+        Ticker cache TTL from config, checked against the fastest scan cadence.
+        A snapshot must expire before the next scan's fetch, otherwise that
+        scan re-uses the previous scan's prices.
+        """
+        monitoring = self.config['monitoring']
+        ttl = monitoring.get(key, default)
+        min_interval = monitoring.get('min_scan_interval_seconds', monitoring['scan_interval_seconds'])
+        # Fetch may finish up to per_exchange_timeout after the scan started
+        limit = min_interval - monitoring.get('per_exchange_timeout_seconds', 2.0)
+        if ttl >= limit:
+            self.logger.warning(
+                f"{key}={ttl}s is not below min scan interval minus fetch timeout ({limit}s) "
+                f"- ticker cache disabled"
+            )
+            return 0.0
+        return ttl
+    
+    def _next_interval(self, interval: float) -> float:
+        """Poll faster while spreads are found, back off after idle scans."""
+        monitoring = self.config['monitoring']
+        base = monitoring['scan_interval_seconds']
+        min_interval = monitoring.get('min_scan_interval_seconds', base)
+        max_interval = monitoring.get('max_scan_interval_seconds', base)
+        idle_scans = monitoring.get('idle_scans_before_backoff', 3)
+        
+        if self.last_opps_found:
+            self._idle_streak = 0
+            return min_interval
+        
+        self._idle_streak += 1
+        if self._idle_streak < idle_scans:
+            return interval
+        return min(max_interval, interval * 1.5)
     
     def _banner(self):
         print(f"""
@@ -333,32 +474,38 @@ class SpreadMonitor:
         self._banner()
         self.running = True
         
-        max_fr = self.config['spread'].get('max_funding_rate', 0.5)
-        self.logger.info(f"Spread: {self.config['spread']['min_threshold']}%+")
-        self.logger.info(f"Volume: ${self.config['spread'].get('min_volume_usdt', 500000)/1e6:.1f}M+")
-        self.logger.info(f"Max Funding Rate: {max_fr}%")
+        cfg = self.spread_cfg
+        self.logger.info(f"Spread: {cfg.min_threshold}%+")
+        self.logger.info(f"Volume: ${cfg.min_volume_usdt/1e6:.1f}M+")
+        self.logger.info(f"Max Funding Rate: {cfg.max_funding_rate}%")
         
         await self.telegram.send_startup_message(
-            min_spread=self.config['spread']['min_threshold'],
+            min_spread=cfg.min_threshold,
             exchanges=["MEXC", "Binance", "Bybit", "Gate", "KuCoin", "OKX", "BingX"]
         )
         
+        if self.ws_books:
+            self._ws_task = asyncio.create_task(self.ws_books.run())
+        self._commands_task = asyncio.create_task(self._command_loop())
+        
         interval = self.config['monitoring']['scan_interval_seconds']
         
         try:
             while self.running:
-                start = datetime.now()
+                start = time.monotonic()
                 
-                await self.process_commands()
                 await self.scan_and_send()
                 
                 if self.scan_count % 30 == 0:
                     self.signals.cleanup_old_entries()
+                    timeouts = {name: n for name, n in self.exchange_timeouts.items() if n}
                     self.logger.info(
-                        f"Stats: Sent={self.alerts_sent} FundingRejected={self.funding_rejected}"
+                        f"Stats: Sent={self.alerts_sent} FundingRejected={self.funding_rejected} "
+                        f"Timeouts={timeouts}"
                     )
                 
-                elapsed = (datetime.now() - start).total_seconds()
+                interval = self._next_interval(interval)
+                elapsed = time.monotonic() - start
                 await asyncio.sleep(max(1, interval - elapsed))
                 
         except KeyboardInterrupt:
@@ -375,6 +522,13 @@ async def main():
 
 
 if __name__ == "__main__":
+    try:
+        # libuv-based event loop: faster sockets/callbacks (not available on Windows)
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
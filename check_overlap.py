@@ -1,4 +1,7 @@
 import asyncio
+import numpy as np
+from exchanges.base_exchange import fetch_all_exchanges
+from exchanges.http import close_session as close_shared_session
 from exchanges.mexc_client import MEXCClient
 from exchanges.binance_client import BinanceClient
 from exchanges.bybit_client import BybitClient
@@ -23,15 +26,17 @@ async def check_overlaps():
     tickers = {}
     
     # Fetch all concurrently
-    tasks = [client.get_all_symbols() for client in clients.values()]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    results = await fetch_all_exchanges(
+        {name: client.get_all_symbols() for name, client in clients.items()}
+    )
     
-    for name, result in zip(clients.keys(), results):
+    for name, result in results.items():
         if isinstance(result, Exception):
             print(f"Error fetching {name}: {result}")
-            tickers[name] = set()
+            tickers[name] = np.array([], dtype=object)
         else:
-            tickers[name] = set(result)
+            # Sorted unique arrays -> intersect1d runs in C
+            tickers[name] = np.unique(np.array(result, dtype=object))
             print(f"{name}: {len(tickers[name])} pairs")
             
     mexc_pairs = tickers["MEXC"]
@@ -40,13 +45,16 @@ async def check_overlaps():
     print(f"MEXC Total: {len(mexc_pairs)}")
     
     for name in ["Binance", "Bybit", "Gate", "KuCoin", "OKX", "BingX"]:
-        other_pairs = tickers.get(name, set())
-        common = mexc_pairs.intersection(other_pairs)
+        other_pairs = tickers.get(name, np.array([], dtype=object))
+        common = np.intersect1d(mexc_pairs, other_pairs, assume_unique=True)
         print(f"MEXC + {name}: {len(common)} pairs")
         
     # Close sessions
-    for client in clients.values():
-        await client.close_session()
+    await asyncio.gather(
+        *(client.close_session() for client in clients.values()),
+        return_exceptions=True
+    )
+    await close_shared_session()
 
 if __name__ == "__main__":
     asyncio.run(check_overlaps())
@@ -0,0 +1,264 @@
+"""
+Pure parsers for bulk ticker responses (no I/O, no client state).
+
+Kept free of async and instance attributes so the module can be compiled
+as-is with mypyc (`mypyc exchanges/_parsers.py`); it runs unchanged as
+plain Python.
+"""
+import logging
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("Exchange.Parsers")
+
+# Суффиксы USDT perpetual контрактов
+BINANCE_SUFFIX = "USDT"     # BTCUSDT
+BYBIT_SUFFIX = "USDT"       # BTCUSDT
+BINGX_SUFFIX = "-USDT"      # BTC-USDT
+GATE_SUFFIX = "_USDT"       # BTC_USDT
+MEXC_SUFFIX = "_USDT"       # BTC_USDT
+OKX_SUFFIX = "-USDT-SWAP"   # BTC-USDT-SWAP
+
+# (symbol, price) из строки ответа одним вызовом
+_BINANCE_FIELDS = itemgetter("symbol", "lastPrice")
+_MEXC_FIELDS = itemgetter("symbol", "lastPrice")
+_BYBIT_FIELDS = itemgetter("symbol", "lastPrice")
+_BINGX_FIELDS = itemgetter("symbol", "lastPrice")
+_GATE_FIELDS = itemgetter("contract", "last")
+_OKX_FIELDS = itemgetter("instId", "last")
+_KUCOIN_FIELDS = itemgetter("symbol", "markPrice")
+
+# (symbol, best bid, best ask) из строки bulk тикера / book ticker
+_BINANCE_BOOK_FIELDS = itemgetter("symbol", "bidPrice", "askPrice")
+_MEXC_BOOK_FIELDS = itemgetter("symbol", "bid1", "ask1")
+_BYBIT_BOOK_FIELDS = itemgetter("symbol", "bid1Price", "ask1Price")
+_BINGX_BOOK_FIELDS = itemgetter("symbol", "bidPrice", "askPrice")
+_GATE_BOOK_FIELDS = itemgetter("contract", "highest_bid", "lowest_ask")
+_OKX_BOOK_FIELDS = itemgetter("instId", "bidPx", "askPx")
+_KUCOIN_BOOK_FIELDS = itemgetter("symbol", "bestBidPrice", "bestAskPrice")
+
+Rows = List[Dict[str, Any]]
+Columns = Tuple[List[str], List[float], List[float]]
+Books = Dict[str, Tuple[float, float]]
+
+
+def parse_binance(rows: Rows) -> Columns:
+    """Binance /ticker/24hr -> (symbols, prices, quote volumes)."""
+    symbols: List[str] = []
+    prices: List[float] = []
+    volumes: List[float] = []
+    _float = float
+    debug_on = logger.isEnabledFor(logging.DEBUG)
+    _add_symbol, _add_price, _add_volume = symbols.append, prices.append, volumes.append
+    _fields = _BINANCE_FIELDS
+    for ticker in rows:
+        try:
+            symbol, last_price = _fields(ticker)
+        except KeyError:
+            continue
+        if not symbol or not symbol.endswith(BINANCE_SUFFIX) or not last_price:
+            continue
+        try:
+            price = _float(last_price)
+            # quoteVolume = объём в USDT
+            volume = _float(ticker.get("quoteVolume") or 0)
+        except (ValueError, TypeError):
+            if debug_on:
+                logger.debug("Skipping invalid Binance ticker: %s", symbol)
+            continue
+        if price > 0:
+            _add_symbol(symbol)
+            _add_price(price)
+            _add_volume(volume)
+    return symbols, prices, volumes
+
+
+def parse_mexc(rows: Rows) -> Columns:
+    """MEXC /contract/ticker -> (symbols, prices, 24h volumes)."""
+    symbols: List[str] = []
+    prices: List[float] = []
+    volumes: List[float] = []
+    _float = float
+    debug_on = logger.isEnabledFor(logging.DEBUG)
+    _add_symbol, _add_price, _add_volume = symbols.append, prices.append, volumes.append
+    _fields = _MEXC_FIELDS
+    for ticker in rows:
+        try:
+            symbol, last_price = _fields(ticker)
+        except KeyError:
+            continue
+        if not symbol or not symbol.endswith(MEXC_SUFFIX) or not last_price:
+            continue
+        try:
+            price = _float(last_price)
+            # Объём в USDT за 24h
+            volume_24h = _float(ticker.get("volume24") or 0)
+        except (ValueError, TypeError):
+            if debug_on:
+                logger.debug("Skipping invalid MEXC ticker: %s", symbol)
+            continue
+        if price > 0:
+            # BTC_USDT -> BTCUSDT
+            _add_symbol(symbol.replace("_", ""))
+            _add_price(price)
+            _add_volume(volume_24h)
+    return symbols, prices, volumes
+
+
+def _parse_prices(
+    rows: Rows,
+    fields: Callable[[Dict[str, Any]], Tuple[Any, Any]],
+    suffix: str,
+    normalize: Optional[Callable[[str], Optional[str]]],
+    label: str
+) -> Dict[str, float]:
+    """
+    Shared {symbol: price} loop.
+
+    fields: itemgetter returning (raw symbol, raw price)
+    suffix: raw symbols not ending with it are skipped ("" = keep all)
+    normalize: raw symbol -> BTCUSDT format, None/"" skips the row (None = as is)
+    label: row kind for debug logs, e.g. "Bybit ticker"
+    """
+    tickers: Dict[str, float] = {}
+    # Локальные ссылки: без поиска атрибутов на каждой итерации
+    _float, _set = float, tickers.__setitem__
+    debug_on = logger.isEnabledFor(logging.DEBUG)
+    for row in rows:
+        try:
+            symbol, last_price = fields(row)
+        except KeyError:
+            continue
+        if not symbol or not symbol.endswith(suffix) or not last_price:
+            continue
+        try:
+            price = _float(last_price)
+        except (ValueError, TypeError):
+            if debug_on:
+                logger.debug("Skipping invalid %s: %s", label, symbol)
+            continue
+        if price > 0:
+            if normalize is not None:
+                symbol = normalize(symbol)
+                if not symbol:
+                    continue
+            _set(symbol, price)
+    return tickers
+
+
+def _drop_underscore(symbol: str) -> str:
+    """BTC_USDT -> BTCUSDT"""
+    return symbol.replace("_", "")
+
+
+def _drop_dash(symbol: str) -> str:
+    """BTC-USDT -> BTCUSDT"""
+    return symbol.replace("-", "")
+
+
+def _okx_symbol(inst_id: str) -> str:
+    """BTC-USDT-SWAP -> BTCUSDT"""
+    return inst_id.replace(OKX_SUFFIX, "USDT")
+
+
+def parse_mexc_prices(rows: Rows) -> Dict[str, float]:
+    """MEXC /contract/ticker -> {symbol: price} (no volume conversion)."""
+    return _parse_prices(rows, _MEXC_FIELDS, MEXC_SUFFIX, _drop_underscore, "MEXC ticker")
+
+
+def parse_bybit(rows: Rows) -> Dict[str, float]:
+    """Bybit /market/tickers (linear) -> {symbol: price}."""
+    return _parse_prices(rows, _BYBIT_FIELDS, BYBIT_SUFFIX, None, "Bybit ticker")
+
+
+def parse_bingx(rows: Rows) -> Dict[str, float]:
+    """BingX /swap/v2/quote/ticker -> {symbol: price}."""
+    return _parse_prices(rows, _BINGX_FIELDS, BINGX_SUFFIX, _drop_dash, "BingX ticker")
+
+
+def parse_gate(rows: Rows) -> Dict[str, float]:
+    """Gate.io /futures/usdt/tickers -> {symbol: price}."""
+    return _parse_prices(rows, _GATE_FIELDS, GATE_SUFFIX, _drop_underscore, "Gate.io ticker")
+
+
+def parse_okx(rows: Rows) -> Dict[str, float]:
+    """OKX /market/tickers (SWAP) -> {symbol: price}."""
+    return _parse_prices(rows, _OKX_FIELDS, OKX_SUFFIX, _okx_symbol, "OKX ticker")
+
+
+def parse_kucoin(rows: Rows, normalize: Callable[[str], Optional[str]]) -> Dict[str, float]:
+    """KuCoin /contracts/active -> {symbol: mark price}; normalize maps XBTUSDTM -> BTCUSDT."""
+    # Только USDT контракты (формат: XBTUSDTM): normalize отсекает остальные
+    return _parse_prices(rows, _KUCOIN_FIELDS, "", normalize, "KuCoin contract")
+
+
+def _parse_books(
+    rows: Rows,
+    fields: Callable[[Dict[str, Any]], Tuple[Any, Any, Any]],
+    suffix: str,
+    normalize: Optional[Callable[[str], Optional[str]]],
+    label: str
+) -> Books:
+    """
+    Shared {symbol: (best_bid, best_ask)} loop; arguments as in _parse_prices,
+    with fields returning (raw symbol, raw bid, raw ask).
+    """
+    books: Books = {}
+    _float, _set = float, books.__setitem__
+    debug_on = logger.isEnabledFor(logging.DEBUG)
+    for row in rows:
+        try:
+            symbol, bid, ask = fields(row)
+        except KeyError:
+            continue
+        if not symbol or not symbol.endswith(suffix):
+            continue
+        try:
+            best_bid = _float(bid or 0)
+            best_ask = _float(ask or 0)
+        except (ValueError, TypeError):
+            if debug_on:
+                logger.debug("Skipping invalid %s book: %s", label, symbol)
+            continue
+        if best_bid > 0 and best_ask > 0:
+            if normalize is not None:
+                symbol = normalize(symbol)
+                if not symbol:
+                    continue
+            _set(symbol, (best_bid, best_ask))
+    return books
+
+
+def parse_binance_books(rows: Rows) -> Books:
+    """Binance /ticker/bookTicker -> {symbol: (bid, ask)}."""
+    return _parse_books(rows, _BINANCE_BOOK_FIELDS, BINANCE_SUFFIX, None, "Binance")
+
+
+def parse_mexc_books(rows: Rows) -> Books:
+    """MEXC /contract/ticker -> {symbol: (bid1, ask1)}."""
+    return _parse_books(rows, _MEXC_BOOK_FIELDS, MEXC_SUFFIX, _drop_underscore, "MEXC")
+
+
+def parse_bybit_books(rows: Rows) -> Books:
+    """Bybit /market/tickers (linear) -> {symbol: (bid, ask)}."""
+    return _parse_books(rows, _BYBIT_BOOK_FIELDS, BYBIT_SUFFIX, None, "Bybit")
+
+
+def parse_bingx_books(rows: Rows) -> Books:
+    """BingX /swap/v2/quote/ticker -> {symbol: (bid, ask)}."""
+    return _parse_books(rows, _BINGX_BOOK_FIELDS, BINGX_SUFFIX, _drop_dash, "BingX")
+
+
+def parse_gate_books(rows: Rows) -> Books:
+    """Gate.io /futures/usdt/tickers -> {symbol: (highest bid, lowest ask)}."""
+    return _parse_books(rows, _GATE_BOOK_FIELDS, GATE_SUFFIX, _drop_underscore, "Gate.io")
+
+
+def parse_okx_books(rows: Rows) -> Books:
+    """OKX /market/tickers (SWAP) -> {symbol: (bid, ask)}."""
+    return _parse_books(rows, _OKX_BOOK_FIELDS, OKX_SUFFIX, _okx_symbol, "OKX")
+
+
+def parse_kucoin_books(rows: Rows, normalize: Callable[[str], Optional[str]]) -> Books:
+    """KuCoin /allTickers -> {symbol: (bid, ask)}; normalize maps XBTUSDTM -> BTCUSDT."""
+    return _parse_books(rows, _KUCOIN_BOOK_FIELDS, "", normalize, "KuCoin")
@@ -0,0 +1,90 @@
+"""Cross-exchange price table (structure of arrays) for vectorized spread scans."""
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, FrozenSet, Optional, Tuple
+import numpy as np
+
+from .base_exchange import fetch_all_exchanges
+from .snapshot import Snapshot
+
+
+@dataclass
+class PriceTable:
+    """
+    Tickers of all exchanges on one shared symbol axis.
+
+    exchanges: row names, in fetch order
+    symbols: sorted union of all symbols (column index)
+    prices: float64 [exchange, symbol], NaN where the exchange has no such pair
+    volumes: float64 [exchange, symbol], 0 where missing or no volume data
+    """
+    exchanges: Tuple[str, ...]
+    symbols: np.ndarray
+    prices: np.ndarray
+    volumes: np.ndarray
+    # {symbol set: bool mask over symbols}, filled lazily by symbol_mask()
+    _masks: Dict[FrozenSet[str], np.ndarray] = field(default_factory=dict, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def row(self, exchange: str) -> int:
+        return self.exchanges.index(exchange)
+
+    def count(self, exchange: str) -> int:
+        """Number of symbols listed on an exchange."""
+        if exchange not in self.exchanges:
+            return 0
+        return int(np.count_nonzero(~np.isnan(self.prices[self.row(exchange)])))
+
+    def symbol_mask(self, names: FrozenSet[str]) -> np.ndarray:
+        """Bool mask over the symbol axis, True where the symbol is in names (cached per table)."""
+        mask = self._masks.get(names)
+        if mask is None:
+            # One set lookup per symbol; np.isin would sort the object array
+            mask = np.fromiter((s in names for s in self.symbols.tolist()), dtype=bool, count=len(self.symbols))
+            self._masks[names] = mask
+        return mask
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Dict[str, Snapshot]) -> "PriceTable":
+        """Scatter per-exchange snapshots into one NaN-padded 2D table."""
+        exchanges = tuple(snapshots)
+        parts = [snap.symbols for snap in snapshots.values() if len(snap)]
+        symbols = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=object)
+
+        prices = np.full((len(exchanges), len(symbols)), np.nan)
+        volumes = np.zeros((len(exchanges), len(symbols)))
+        for row, snap in enumerate(snapshots.values()):
+            if len(snap):
+                # Snapshot symbols are unique and sorted, so searchsorted gives exact columns
+                cols = np.searchsorted(symbols, snap.symbols)
+                prices[row, cols] = snap.prices
+                volumes[row, cols] = snap.volumes
+        return cls(exchanges, symbols, prices, volumes)
+
+
+def _to_snapshot(raw: Any) -> Snapshot:
+    """Fetch result -> Snapshot (errors and timeouts become empty)."""
+    if isinstance(raw, Exception):
+        return Snapshot.empty()
+    if isinstance(raw, Snapshot):
+        return raw
+    return Snapshot.from_dict(raw)
+
+
+async def fetch_table(
+    calls: Dict[str, Awaitable],
+    timeout: Optional[float] = None
+) -> Tuple[PriceTable, Dict[str, Any]]:
+    """
+    Fetch all exchanges concurrently and build the price table.
+
+    Args:
+        calls: {exchange_name: coroutine returning Snapshot or {symbol: price}}
+        timeout: Optional per-call limit
+    Returns:
+        (table, raw results incl. exceptions for error accounting)
+    """
+    results = await fetch_all_exchanges(calls, timeout=timeout)
+    table = PriceTable.from_snapshots({name: _to_snapshot(raw) for name, raw in results.items()})
+    return table, results
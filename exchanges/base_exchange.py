@@ -1,43 +1,146 @@
 """Base class for all exchange clients."""
+import functools
 import logging
-from typing import Dict, List, Optional
+import time
+from typing import Any, Awaitable, Dict, List, Mapping, Optional
 import aiohttp
 import asyncio
+import orjson
+from .http import get_session
+
+
+async def fetch_all_exchanges(
+    calls: Dict[str, Awaitable],
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Await one call per exchange concurrently (wall time = slowest call).
+    
+    Args:
+        calls: {exchange_name: coroutine}
+        timeout: Optional per-call limit (asyncio.wait_for)
+    Returns:
+        {exchange_name: result or the raised exception}
+    """
+    if timeout is not None:
+        calls = {name: asyncio.wait_for(call, timeout) for name, call in calls.items()}
+    
+    results = dict(zip(calls, await asyncio.gather(*calls.values(), return_exceptions=True)))
+    
+    logger = logging.getLogger("Exchange")
+    for name, result in results.items():
+        if isinstance(result, asyncio.TimeoutError):
+            logger.warning(f"{name}: timed out after {timeout}s")
+        elif isinstance(result, Exception):
+            logger.error(f"{name}: {result}")
+    return results
+
+
+def ttl_cached(func):
+    """
+    Cache a no-argument coroutine method per instance for self.cache_ttl seconds.
+    Empty results (failed fetches) are not cached.
+    """
+    key = func.__name__
+    
+    @functools.wraps(func)
+    async def wrapper(self):
+        if self.cache_ttl > 0:
+            entry = self._ttl_cache.get(key)
+            if entry and time.monotonic() - entry[0] < self.cache_ttl:
+                return entry[1]
+        
+        result = await func(self)
+        if result:
+            self._ttl_cache[key] = (time.monotonic(), result)
+        return result
+    
+    return wrapper
 
 
 class BaseExchange:
     """Base class for exchange API clients."""
     
-    def __init__(self, name: str):
+    MAX_CONCURRENCY = 10        # In-flight requests per exchange (override per client)
+    MAX_RETRIES = 3             # Retries on HTTP 429/418 (rate limited)
+    MAX_BACKOFF_SECONDS = 60.0
+    ORDERBOOK_WORKERS = 8       # Workers draining the per-symbol orderbook queue
+    ORDERBOOK_BATCH = 4         # Requests each worker issues concurrently
+    
+    def __init__(self, name: str, cache_ttl: float = 0.0, max_concurrency: Optional[int] = None):
+        """
+        Args:
+            name: Exchange name used in logs and lookups
+            cache_ttl: Seconds to reuse full-ticker snapshots (0 = no caching)
+            max_concurrency: In-flight request limit (default: MAX_CONCURRENCY)
+        """
         self.name = name
         self.logger = logging.getLogger(f"Exchange.{name}")
         self.session: Optional[aiohttp.ClientSession] = None
+        self.cache_ttl = cache_ttl
+        self._ttl_cache: Dict[str, tuple] = {}
+        
+        # Pace requests below the rate limit instead of tripping it
+        self._sem = asyncio.Semaphore(max_concurrency or self.MAX_CONCURRENCY)
+        self._blocked_until = 0.0
+        
+        # Per-symbol orderbook requests: (symbol, future) pulled by a fixed worker pool
+        self._orderbook_queue: Optional[asyncio.Queue] = None
+        self._orderbook_workers: List[asyncio.Task] = []
         
     async def init_session(self):
-        """Initialize aiohttp session."""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=10)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        """Attach the shared aiohttp session."""
+        if not self.session or self.session.closed:
+            self.session = get_session()
     
     async def close_session(self):
-        """Close aiohttp session."""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Detach from the shared session (closed once via exchanges.http.close_session)."""
+        for worker in self._orderbook_workers:
+            worker.cancel()
+        await asyncio.gather(*self._orderbook_workers, return_exceptions=True)
+        while self._orderbook_queue and not self._orderbook_queue.empty():
+            self._orderbook_queue.get_nowait()[1].cancel()
+        self._orderbook_workers = []
+        self._orderbook_queue = None
+        self.session = None
+    
+    def _backoff_delay(self, response: aiohttp.ClientResponse, attempt: int) -> float:
+        """Delay from Retry-After header, else exponential (1s, 2s, 4s...)."""
+        try:
+            delay = float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            delay = 2.0 ** attempt
+        return min(delay, self.MAX_BACKOFF_SECONDS)
     
-    async def _get(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
-        """Make GET request with error handling."""
+    async def _get(self, url: str, params: Optional[Mapping] = None) -> Optional[Dict]:
+        """Make GET request with error handling and rate-limit backoff."""
         try:
             await self.init_session()
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    self.logger.error(f"HTTP {response.status} for {url}")
-                    return None
+            for attempt in range(self.MAX_RETRIES + 1):
+                # All requests to this exchange wait out a 429/418 backoff
+                wait = self._blocked_until - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                
+                async with self._sem:
+                    async with self.session.get(url, params=params) as response:
+                        if response.status == 200:
+                            # orjson parses large ticker arrays much faster than stdlib json
+                            return orjson.loads(await response.read())
+                        
+                        if response.status not in (429, 418) or attempt == self.MAX_RETRIES:
+                            self.logger.error(f"HTTP {response.status} for {url}")
+                            return None
+                        
+                        delay = self._backoff_delay(response, attempt)
+                        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+                        self.logger.warning(f"HTTP {response.status} for {url}, backing off {delay:.1f}s")
         except asyncio.TimeoutError:
             self.logger.error(f"Timeout for {url}")
             return None
+        except orjson.JSONDecodeError as e:
+            self.logger.error(f"Invalid JSON from {url}: {e}")
+            return None
         except Exception as e:
             self.logger.error(f"Error fetching {url}: {e}")
             return None
@@ -52,16 +155,25 @@ class BaseExchange:
     async def get_ticker(self, symbol: str) -> Optional[float]:
         """
         Get current price for a symbol.
-        Must be implemented by child classes.
+        With cache_ttl set, served from the ttl_cached get_all_tickers snapshot;
+        single-symbol request otherwise or if missing there.
         """
-        raise NotImplementedError("get_ticker must be implemented by child class")
+        if self.cache_ttl > 0:
+            price = (await self.get_all_tickers()).get(symbol)
+            if price is not None:
+                return price
+        return await self._fetch_ticker(symbol)
     
-    async def get_all_symbols(self) -> List[str]:
+    async def _fetch_ticker(self, symbol: str) -> Optional[float]:
         """
-        Get list of all available symbols.
+        Get current price for a symbol with a single-symbol request.
         Must be implemented by child classes.
         """
-        raise NotImplementedError("get_all_symbols must be implemented by child class")
+        raise NotImplementedError("_fetch_ticker must be implemented by child class")
+    
+    async def get_all_symbols(self) -> List[str]:
+        """Get list of all available symbols."""
+        return list((await self.get_all_tickers()).keys())
     
     async def get_all_tickers(self) -> Dict[str, float]:
         """
@@ -76,3 +188,60 @@ class BaseExchange:
         Returns: (best_bid, best_ask) or None
         """
         raise NotImplementedError("get_orderbook_ticker must be implemented by child class")
+
+    async def batch_orderbook_tickers(self, symbols: List[str]) -> Dict[str, Optional[tuple[float, float]]]:
+        """
+        Get best bid/ask for many symbols concurrently.
+        Safe to call with hundreds of symbols: _get caps in-flight requests.
+        Returns: {symbol: (best_bid, best_ask) or None}
+        """
+        futures = [await self.enqueue_orderbook(s) for s in symbols]
+        results = await asyncio.gather(*futures)
+        return dict(zip(symbols, results))
+    
+    async def enqueue_orderbook(self, symbol: str) -> asyncio.Future:
+        """
+        Queue a get_orderbook_ticker call for the worker pool.
+        Returns a future resolving to (best_bid, best_ask) or None.
+        """
+        if self._orderbook_queue is None:
+            self._orderbook_queue = asyncio.Queue()
+            self._orderbook_workers = [
+                asyncio.create_task(self._orderbook_worker(self._orderbook_queue))
+                for _ in range(self.ORDERBOOK_WORKERS)
+            ]
+        future = asyncio.get_running_loop().create_future()
+        await self._orderbook_queue.put((symbol, future))
+        return future
+    
+    async def _orderbook_worker(self, queue: asyncio.Queue):
+        """Pull up to ORDERBOOK_BATCH queued symbols and fetch them concurrently."""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.ORDERBOOK_BATCH and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            try:
+                results = await asyncio.gather(
+                    *(self.get_orderbook_ticker(symbol) for symbol, _ in batch),
+                    return_exceptions=True
+                )
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def get_all_orderbook_tickers(self) -> Dict[str, tuple[float, float]]:
+        """
+        Get best bid and ask for all symbols in one request.
+        Returns: {symbol: (best_bid, best_ask)}
+        """
+        raise NotImplementedError("get_all_orderbook_tickers must be implemented by child class")
@@ -1,56 +1,48 @@
 """Binance Futures API client with volume data."""
-from typing import Dict, List, Optional, Tuple
-from .base_exchange import BaseExchange
+from typing import Dict, Optional, Tuple
+from .base_exchange import BaseExchange, ttl_cached
+from ._parsers import parse_binance, parse_binance_books
+from .snapshot import Snapshot
 
 
 class BinanceClient(BaseExchange):
     """Binance USDT-M Futures API client with volume."""
     
     BASE_URL = "https://fapi.binance.com/fapi/v1"
+    TICKER_24HR_URL = f"{BASE_URL}/ticker/24hr"
+    TICKER_PRICE_URL = f"{BASE_URL}/ticker/price"
+    BOOK_TICKER_URL = f"{BASE_URL}/ticker/bookTicker"
+    MAX_CONCURRENCY = 20
     
-    def __init__(self):
-        super().__init__("Binance")
+    def __init__(self, cache_ttl: float = 0.0, max_concurrency: Optional[int] = None):
+        super().__init__("Binance", cache_ttl, max_concurrency)
     
-    async def get_all_tickers_with_volume(self) -> Dict[str, Tuple[float, float]]:
+    @ttl_cached
+    async def get_all_tickers_with_volume(self) -> Snapshot:
         """
         Get all futures tickers with 24h volume from Binance.
-        Returns: {symbol: (price, volume_24h_usdt)}
+        Returns: Snapshot(symbols, prices, volumes_24h_usdt)
         """
-        url = f"{self.BASE_URL}/ticker/24hr"
-        data = await self._get(url)
+        data = await self._get(self.TICKER_24HR_URL)
         
         if not data:
             self.logger.error("Failed to fetch Binance tickers")
-            return {}
-        
-        tickers = {}
-        for ticker in data:
-            try:
-                symbol = ticker.get("symbol")
-                # Только USDT perpetual
-                if symbol and symbol.endswith("USDT"):
-                    price = float(ticker.get("lastPrice", 0))
-                    # quoteVolume = объём в USDT
-                    volume = float(ticker.get("quoteVolume", 0))
-                    
-                    if price > 0:
-                        tickers[symbol] = (price, volume)
-            except (ValueError, KeyError) as e:
-                self.logger.debug(f"Skipping invalid ticker: {e}")
-                continue
+            return Snapshot.empty()
         
-        self.logger.info(f"Loaded {len(tickers)} Binance futures")
-        return tickers
+        symbols, prices, volumes = parse_binance(data)
+        snapshot = Snapshot.build(symbols, prices, volumes)
+        self.logger.info(f"Loaded {len(snapshot)} Binance futures")
+        return snapshot
     
+    @ttl_cached
     async def get_all_tickers(self) -> Dict[str, float]:
         """Get all futures tickers from Binance (price only)."""
-        tickers_with_vol = await self.get_all_tickers_with_volume()
-        return {symbol: price for symbol, (price, _) in tickers_with_vol.items()}
+        snapshot = await self.get_all_tickers_with_volume()
+        return snapshot.to_price_dict()
     
-    async def get_ticker(self, symbol: str) -> Optional[float]:
-        """Get price for a specific symbol."""
-        url = f"{self.BASE_URL}/ticker/price"
-        data = await self._get(url, params={"symbol": symbol})
+    async def _fetch_ticker(self, symbol: str) -> Optional[float]:
+        """Get price for a specific symbol (single-symbol request)."""
+        data = await self._get(self.TICKER_PRICE_URL, params={"symbol": symbol})
         
         if data and "price" in data:
             try:
@@ -60,15 +52,9 @@ class BinanceClient(BaseExchange):
         
         return None
     
-    async def get_all_symbols(self) -> List[str]:
-        """Get list of all available symbols."""
-        tickers = await self.get_all_tickers()
-        return list(tickers.keys())
-
     async def get_orderbook_ticker(self, symbol: str) -> Optional[Tuple[float, float]]:
         """Get best bid and ask for validation."""
-        url = f"{self.BASE_URL}/ticker/bookTicker"
-        data = await self._get(url, params={"symbol": symbol})
+        data = await self._get(self.BOOK_TICKER_URL, params={"symbol": symbol})
         
         if data and "bidPrice" in data and "askPrice" in data:
             try:
@@ -81,3 +67,13 @@ class BinanceClient(BaseExchange):
                 pass
         
         return None
+
+    async def get_all_orderbook_tickers(self) -> Dict[str, Tuple[float, float]]:
+        """Get best bid and ask for all symbols in one request."""
+        data = await self._get(self.BOOK_TICKER_URL)
+        
+        if not data:
+            self.logger.error("Failed to fetch Binance book tickers")
+            return {}
+        
+        return parse_binance_books(data)
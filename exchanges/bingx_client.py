@@ -1,51 +1,65 @@
 """BingX Futures API client."""
-from typing import Dict, List, Optional, Tuple
-from .base_exchange import BaseExchange
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from .base_exchange import BaseExchange, ttl_cached
+from ._parsers import parse_bingx, parse_bingx_books
+
+
+@lru_cache(maxsize=4096)
+def _to_bingx(symbol: str) -> str:
+    """BTCUSDT -> BTC-USDT"""
+    return symbol.replace("USDT", "-USDT") if "-" not in symbol else symbol
+
+
+def _level_price(level) -> float:
+    """Price of a depth level: [[price, vol], ...] or [{"p": ..., "v": ...}, ...]."""
+    if isinstance(level, dict):
+        return float(level.get("p", level.get("price", 0)))
+    return float(level[0])
 
 
 class BingXClient(BaseExchange):
     """BingX Perpetual Futures API client."""
     
     BASE_URL = "https://open-api.bingx.com/openApi"
+    TICKER_URL = f"{BASE_URL}/swap/v2/quote/ticker"
+    DEPTH_URL = f"{BASE_URL}/swap/v2/quote/depth"
     
-    def __init__(self):
-        super().__init__("BingX")
+    def __init__(self, cache_ttl: float = 0.0, max_concurrency: Optional[int] = None):
+        super().__init__("BingX", cache_ttl, max_concurrency)
     
-    async def get_all_tickers(self) -> Dict[str, float]:
-        """Get all perpetual futures tickers from BingX."""
-        url = f"{self.BASE_URL}/swap/v2/quote/ticker"
-        data = await self._get(url)
+    @ttl_cached
+    async def _ticker_rows(self) -> list:
+        """
+        Raw bulk ticker rows, reused for cache_ttl seconds.
+        Prices (get_all_tickers) and bid/ask (get_all_orderbook_tickers)
+        are parsed from the same payload instead of a second request.
+        """
+        data = await self._get(self.TICKER_URL)
         
         if not data or "data" not in data:
             self.logger.error("Failed to fetch BingX tickers")
+            return []
+        return data["data"]
+    
+    @ttl_cached
+    async def get_all_tickers(self) -> Dict[str, float]:
+        """Get all perpetual futures tickers from BingX."""
+        rows = await self._ticker_rows()
+        if not rows:
             return {}
         
-        tickers = {}
-        for ticker in data["data"]:
-            try:
-                symbol = ticker.get("symbol")
-                # Формат: BTC-USDT, нас интересуют USDT пары
-                if symbol and "-USDT" in symbol:
-                    # Преобразуем BTC-USDT -> BTCUSDT
-                    normalized = symbol.replace("-", "")
-                    price = float(ticker.get("lastPrice", 0))
-                    if price > 0:
-                        tickers[normalized] = price
-            except (ValueError, KeyError) as e:
-                self.logger.debug(f"Skipping invalid ticker: {e}")
-                continue
-        
+        tickers = parse_bingx(rows)
         self.logger.info(f"Loaded {len(tickers)} BingX perpetual futures")
         return tickers
     
-    async def get_ticker(self, symbol: str) -> Optional[float]:
-        """Get price for a specific symbol."""
+    async def _fetch_ticker(self, symbol: str) -> Optional[float]:
+        """Get price for a specific symbol (single-symbol request)."""
         # BingX использует формат BTC-USDT
-        bingx_symbol = symbol.replace("USDT", "-USDT") if "-" not in symbol else symbol
+        bingx_symbol = _to_bingx(symbol)
         
-        url = f"{self.BASE_URL}/swap/v2/quote/ticker"
         params = {"symbol": bingx_symbol}
-        data = await self._get(url, params=params)
+        data = await self._get(self.TICKER_URL, params=params)
         
         if data and "data" in data and "lastPrice" in data["data"]:
             try:
@@ -55,49 +69,24 @@ class BingXClient(BaseExchange):
         
         return None
     
-    async def get_all_symbols(self) -> List[str]:
-        """Get list of all available symbols."""
-        tickers = await self.get_all_tickers()
-        return list(tickers.keys())
-
     async def get_orderbook_ticker(self, symbol: str) -> Optional[Tuple[float, float]]:
         """Get best bid and ask for validation."""
         # BingX format: BTC-USDT
-        bingx_symbol = symbol.replace("USDT", "-USDT") if "-" not in symbol else symbol
+        bingx_symbol = _to_bingx(symbol)
         
-        url = f"{self.BASE_URL}/swap/v2/quote/depth"
+        # 5 is the smallest depth BingX accepts (5/10/20/50/100...)
         params = {"symbol": bingx_symbol, "limit": 5}
-        data = await self._get(url, params=params)
+        data = await self._get(self.DEPTH_URL, params=params)
         
-        # Responses logic can vary, commonly data['data']['bids']...
-        # Checking docs or assuming standard structure
         if data and "data" in data:
             try:
-                bids = data["data"].get("bids", [])
-                asks = data["data"].get("asks", [])
-                
-                if bids and asks:
-                    # BingX often sends [{"p": "...", "v": ...}] or [[p,v],...]
-                    # Let's inspect generic handling. Standard is usually [[price, vol]]
-                    # But if it returns dicts, we handle it.
-                    # Based on other APIs, list of lists is most common for depth.
-                    
-                    best_bid_raw = bids[0]
-                    best_ask_raw = asks[0]
-                    
-                    # Similar to Gate, safe check
-                    if isinstance(best_bid_raw, dict):
-                         best_bid = float(best_bid_raw.get("p", best_bid_raw.get("price", 0)))
-                    else:
-                         best_bid = float(best_bid_raw[0])
-
-                    if isinstance(best_ask_raw, dict):
-                         best_ask = float(best_ask_raw.get("p", best_ask_raw.get("price", 0)))
-                    else:
-                         best_ask = float(best_ask_raw[0])
-                    
-                    return best_bid, best_ask
-            except (ValueError, IndexError, KeyError):
+                book = data["data"]
+                return _level_price(book["bids"][0]), _level_price(book["asks"][0])
+            except (ValueError, IndexError, KeyError, TypeError):
                 pass
         
         return None
+
+    async def get_all_orderbook_tickers(self) -> Dict[str, Tuple[float, float]]:
+        """Get best bid and ask for all symbols (from the shared bulk ticker payload)."""
+        return parse_bingx_books(await self._ticker_rows())
@@ -1,47 +1,51 @@
 """Bybit Futures API client."""
-from typing import Dict, List, Optional, Tuple
-from .base_exchange import BaseExchange
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple
+from .base_exchange import BaseExchange, ttl_cached
+from ._parsers import parse_bybit, parse_bybit_books
 
 
 class BybitClient(BaseExchange):
     """Bybit Linear Perpetual Futures API client."""
     
     BASE_URL = "https://api.bybit.com/v5"
+    TICKERS_URL = f"{BASE_URL}/market/tickers"
+    ORDERBOOK_URL = f"{BASE_URL}/market/orderbook"
+    LINEAR_PARAMS = MappingProxyType({"category": "linear"})  # USDT perpetual
+    MAX_CONCURRENCY = 20
     
-    def __init__(self):
-        super().__init__("Bybit")
+    def __init__(self, cache_ttl: float = 0.0, max_concurrency: Optional[int] = None):
+        super().__init__("Bybit", cache_ttl, max_concurrency)
     
-    async def get_all_tickers(self) -> Dict[str, float]:
-        """Get all linear futures tickers from Bybit."""
-        url = f"{self.BASE_URL}/market/tickers"
-        params = {"category": "linear"}  # USDT perpetual
-        data = await self._get(url, params=params)
+    @ttl_cached
+    async def _ticker_rows(self) -> list:
+        """
+        Raw bulk ticker rows, reused for cache_ttl seconds.
+        Prices (get_all_tickers) and bid/ask (get_all_orderbook_tickers)
+        are parsed from the same payload instead of a second request.
+        """
+        data = await self._get(self.TICKERS_URL, params=self.LINEAR_PARAMS)
         
         if not data or "result" not in data or "list" not in data["result"]:
             self.logger.error("Failed to fetch Bybit tickers")
+            return []
+        return data["result"]["list"]
+    
+    @ttl_cached
+    async def get_all_tickers(self) -> Dict[str, float]:
+        """Get all linear futures tickers from Bybit."""
+        rows = await self._ticker_rows()
+        if not rows:
             return {}
         
-        tickers = {}
-        for ticker in data["result"]["list"]:
-            try:
-                symbol = ticker.get("symbol")
-                # Только USDT perpetual
-                if symbol and symbol.endswith("USDT"):
-                    price = float(ticker.get("lastPrice", 0))
-                    if price > 0:
-                        tickers[symbol] = price
-            except (ValueError, KeyError) as e:
-                self.logger.debug(f"Skipping invalid ticker: {e}")
-                continue
-        
+        tickers = parse_bybit(rows)
         self.logger.info(f"Loaded {len(tickers)} Bybit linear futures")
         return tickers
     
-    async def get_ticker(self, symbol: str) -> Optional[float]:
-        """Get price for a specific symbol."""
-        url = f"{self.BASE_URL}/market/tickers"
+    async def _fetch_ticker(self, symbol: str) -> Optional[float]:
+        """Get price for a specific symbol (single-symbol request)."""
         params = {"category": "linear", "symbol": symbol}
-        data = await self._get(url, params=params)
+        data = await self._get(self.TICKERS_URL, params=params)
         
         if data and "result" in data and "list" in data["result"]:
             try:
@@ -51,17 +55,11 @@ class BybitClient(BaseExchange):
         
         return None
     
-    async def get_all_symbols(self) -> List[str]:
-        """Get list of all available symbols."""
-        tickers = await self.get_all_tickers()
-        return list(tickers.keys())
-
     async def get_orderbook_ticker(self, symbol: str) -> Optional[Tuple[float, float]]:
         """Get best bid and ask for validation."""
-        url = f"{self.BASE_URL}/market/orderbook"
         # category=linear for USDT perp
         params = {"category": "linear", "symbol": symbol, "limit": 1}
-        data = await self._get(url, params=params)
+        data = await self._get(self.ORDERBOOK_URL, params=params)
         
         if data and "result" in data and "b" in data["result"] and "a" in data["result"]:
             try:
@@ -77,3 +75,7 @@ class BybitClient(BaseExchange):
                 pass
         
         return None
+
+    async def get_all_orderbook_tickers(self) -> Dict[str, Tuple[float, float]]:
+        """Get best bid and ask for all symbols (from the shared bulk ticker payload)."""
+        return parse_bybit_books(await self._ticker_rows())
@@ -1,49 +1,59 @@
 """Gate.io Futures API client."""
-from typing import Dict, List, Optional, Tuple
-from .base_exchange import BaseExchange
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from .base_exchange import BaseExchange, ttl_cached
+from ._parsers import parse_gate, parse_gate_books
+
+
+@lru_cache(maxsize=4096)
+def _to_gate(symbol: str) -> str:
+    """BTCUSDT -> BTC_USDT"""
+    return symbol.replace("USDT", "_USDT") if "_" not in symbol else symbol
 
 
 class GateClient(BaseExchange):
     """Gate.io USDT Perpetual Futures API client."""
     
     BASE_URL = "https://api.gateio.ws/api/v4"
+    TICKERS_URL = f"{BASE_URL}/futures/usdt/tickers"
+    ORDER_BOOK_URL = f"{BASE_URL}/futures/usdt/order_book"
+    CONTRACTS_URL = f"{BASE_URL}/futures/usdt/contracts"
+    MAX_CONCURRENCY = 10
     
-    def __init__(self):
-        super().__init__("Gate")
+    def __init__(self, cache_ttl: float = 0.0, max_concurrency: Optional[int] = None):
+        super().__init__("Gate", cache_ttl, max_concurrency)
     
-    async def get_all_tickers(self) -> Dict[str, float]:
-        """Get all USDT futures tickers from Gate.io."""
-        url = f"{self.BASE_URL}/futures/usdt/tickers"
-        data = await self._get(url)
+    @ttl_cached
+    async def _ticker_rows(self) -> list:
+        """
+        Raw bulk ticker rows, reused for cache_ttl seconds.
+        Prices (get_all_tickers) and bid/ask (get_all_orderbook_tickers)
+        are parsed from the same payload instead of a second request.
+        """
+        data = await self._get(self.TICKERS_URL)
         
         if not data:
             self.logger.error("Failed to fetch Gate.io tickers")
+            return []
+        return data
+    
+    @ttl_cached
+    async def get_all_tickers(self) -> Dict[str, float]:
+        """Get all USDT futures tickers from Gate.io."""
+        rows = await self._ticker_rows()
+        if not rows:
             return {}
         
-        tickers = {}
-        for ticker in data:
-            try:
-                contract = ticker.get("contract")
-                # Контракты в формате BTC_USDT
-                if contract and "_USDT" in contract:
-                    # Преобразуем BTC_USDT -> BTCUSDT
-                    symbol = contract.replace("_", "")
-                    price = float(ticker.get("last", 0))
-                    if price > 0:
-                        tickers[symbol] = price
-            except (ValueError, KeyError) as e:
-                self.logger.debug(f"Skipping invalid ticker: {e}")
-                continue
-        
+        tickers = parse_gate(rows)
         self.logger.info(f"Loaded {len(tickers)} Gate.io USDT futures")
         return tickers
     
-    async def get_ticker(self, symbol: str) -> Optional[float]:
-        """Get price for a specific symbol."""
+    async def _fetch_ticker(self, symbol: str) -> Optional[float]:
+        """Get price for a specific symbol (single-symbol request)."""
         # Gate использует формат BTC_USDT
-        gate_symbol = symbol.replace("USDT", "_USDT") if "_" not in symbol else symbol
+        gate_symbol = _to_gate(symbol)
         
-        url = f"{self.BASE_URL}/futures/usdt/contracts/{gate_symbol}"
+        url = f"{self.CONTRACTS_URL}/{gate_symbol}"
         data = await self._get(url)
         
         if data and "last_price" in data:
@@ -54,19 +64,13 @@ class GateClient(BaseExchange):
         
         return None
     
-    async def get_all_symbols(self) -> List[str]:
-        """Get list of all available symbols."""
-        tickers = await self.get_all_tickers()
-        return list(tickers.keys())
-
     async def get_orderbook_ticker(self, symbol: str) -> Optional[Tuple[float, float]]:
         """Get best bid and ask for validation."""
         # Gate format: BTC_USDT
-        gate_symbol = symbol.replace("USDT", "_USDT") if "_" not in symbol else symbol
+        gate_symbol = _to_gate(symbol)
         
-        url = f"{self.BASE_URL}/futures/usdt/order_book"
         params = {"contract": gate_symbol, "limit": 1}
-        data = await self._get(url, params=params)
+        data = await self._get(self.ORDER_BOOK_URL, params=params)
         
         if data and "bids" in data and "asks" in data:
             try:
@@ -98,3 +102,7 @@ class GateClient(BaseExchange):
                 pass
         
         return None
+
+    async def get_all_orderbook_tickers(self) -> Dict[str, Tuple[float, float]]:
+        """Get best bid and ask for all symbols (from the shared bulk ticker payload)."""
+        return parse_gate_books(await self._ticker_rows())
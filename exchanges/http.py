@@ -0,0 +1,46 @@
+"""Shared HTTP session for all REST clients."""
+import socket
+from typing import Optional
+import aiohttp
+
+try:
+    import aiodns  # noqa: F401  (enables aiohttp.AsyncResolver)
+except ImportError:  # Optional: fall back to aiohttp's threaded getaddrinfo resolver
+    aiodns = None
+
+
+# One session and connection pool for every exchange client and the funding
+# checker: DNS cache, TLS sessions and keep-alive sockets are reused across
+# clients and scans.
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Get the shared session, creating it inside the running event loop."""
+    global _session
+    if _session is None or _session.closed:
+        # Same few API hosts every scan: cache DNS for 10 min, IPv4 only
+        # (no happy-eyeballs fallback attempts on hosts without working IPv6)
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            resolver=aiohttp.AsyncResolver() if aiodns is not None else None,
+            family=socket.AF_INET,
+            use_dns_cache=True,
+            ttl_dns_cache=600,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        _session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10),
+            connector=connector
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared session and its connector. Call once on shutdown."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
@@ -1,53 +1,56 @@
 """KuCoin Futures API client - Fixed version."""
-from typing import Dict, List, Optional, Tuple
-from .base_exchange import BaseExchange
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from .base_exchange import BaseExchange, ttl_cached
+from ._parsers import parse_kucoin, parse_kucoin_books
+
+
+@lru_cache(maxsize=4096)
+def _to_kucoin(symbol: str) -> str:
+    """BTCUSDT -> XBTUSDTM"""
+    kucoin_symbol = symbol
+    if symbol.startswith("BTC"):
+        kucoin_symbol = "XBT" + symbol[3:]
+    if not kucoin_symbol.endswith("M"):
+        kucoin_symbol += "M"
+    return kucoin_symbol
 
 
 class KuCoinClient(BaseExchange):
     """KuCoin USDT Perpetual Futures API client."""
     
     BASE_URL = "https://api-futures.kucoin.com/api/v1"
+    CONTRACTS_URL = f"{BASE_URL}/contracts/active"
+    TICKER_URL = f"{BASE_URL}/ticker"
+    DEPTH_URL = f"{BASE_URL}/level2/depth20"
+    ALL_TICKERS_URL = f"{BASE_URL}/allTickers"
+    MAX_CONCURRENCY = 5
     
-    def __init__(self):
-        super().__init__("KuCoin")
+    # Префиксы KuCoin -> стандартные (KuCoin использует XBT вместо BTC)
+    _REPLACEMENTS = (("XBT", "BTC"),)
     
+    def __init__(self, cache_ttl: float = 0.0, max_concurrency: Optional[int] = None):
+        super().__init__("KuCoin", cache_ttl, max_concurrency)
+    
+    @ttl_cached
     async def get_all_tickers(self) -> Dict[str, float]:
         """Get all futures tickers from KuCoin."""
         # Сначала получаем список всех контрактов
-        contracts_url = f"{self.BASE_URL}/contracts/active"
-        contracts_data = await self._get(contracts_url)
+        contracts_data = await self._get(self.CONTRACTS_URL)
         
         if not contracts_data or "data" not in contracts_data:
             self.logger.error("Failed to fetch KuCoin contracts list")
             return {}
         
-        tickers = {}
-        
-        # Для каждого USDT контракта получаем цену
-        for contract in contracts_data["data"]:
-            try:
-                symbol = contract.get("symbol")
-                # Только USDT контракты (формат: XBTUSDTM)
-                if not symbol or "USDT" not in symbol:
-                    continue
-                
-                # Получаем последнюю цену из markPrice
-                mark_price = contract.get("markPrice")
-                if mark_price:
-                    price = float(mark_price)
-                    if price > 0:
-                        # Нормализуем символ: XBTUSDTM -> BTCUSDT
-                        normalized = self._normalize_symbol(symbol)
-                        if normalized:
-                            tickers[normalized] = price
-            except (ValueError, KeyError) as e:
-                self.logger.debug(f"Skipping contract: {e}")
-                continue
+        # Цена берётся из markPrice списка контрактов
+        tickers = parse_kucoin(contracts_data["data"], self._normalize_symbol)
         
         self.logger.info(f"Loaded {len(tickers)} KuCoin futures")
         return tickers
     
-    def _normalize_symbol(self, symbol: str) -> Optional[str]:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_symbol(symbol: str) -> Optional[str]:
         """
         Normalize KuCoin symbol to standard format.
         XBTUSDTM -> BTCUSDT
@@ -62,28 +65,23 @@ class KuCoinClient(BaseExchange):
             clean = clean[:-1]
         
         # Специальные преобразования
-        replacements = {
-            "XBT": "BTC",  # KuCoin использует XBT вместо BTC
-        }
-        
-        for old, new in replacements.items():
+        for old, new in KuCoinClient._REPLACEMENTS:
             if clean.startswith(old):
                 clean = new + clean[len(old):]
         
         return clean
     
     async def get_ticker(self, symbol: str) -> Optional[float]:
-        """Get price for a specific symbol."""
+        """Get last trade price (the bulk snapshot holds markPrice, so it is not used here)."""
+        return await self._fetch_ticker(symbol)
+    
+    async def _fetch_ticker(self, symbol: str) -> Optional[float]:
+        """Get price for a specific symbol (single-symbol request)."""
         # Преобразуем обратно в формат KuCoin
-        kucoin_symbol = symbol
-        if symbol.startswith("BTC"):
-            kucoin_symbol = "XBT" + symbol[3:]
-        if not kucoin_symbol.endswith("M"):
-            kucoin_symbol += "M"
+        kucoin_symbol = _to_kucoin(symbol)
         
-        url = f"{self.BASE_URL}/ticker"
         params = {"symbol": kucoin_symbol}
-        data = await self._get(url, params=params)
+        data = await self._get(self.TICKER_URL, params=params)
         
         if data and "data" in data and "price" in data["data"]:
             try:
@@ -93,26 +91,16 @@ class KuCoinClient(BaseExchange):
         
         return None
     
-    async def get_all_symbols(self) -> List[str]:
-        """Get list of all available symbols."""
-        tickers = await self.get_all_tickers()
-        return list(tickers.keys())
-
     async def get_orderbook_ticker(self, symbol: str) -> Optional[Tuple[float, float]]:
         """Get best bid and ask for validation."""
         # KuCoin format: XBTUSDTM
-        kucoin_symbol = symbol
-        if symbol.startswith("BTC"):
-            kucoin_symbol = "XBT" + symbol[3:]
-        if not kucoin_symbol.endswith("M"):
-            kucoin_symbol += "M"
+        kucoin_symbol = _to_kucoin(symbol)
             
         # Endpoint: /api/v1/level1/depth is for spot or specific permissions?
         # Use /api/v1/level2/depth20 (public) or /api/v1/level2/snapshot
         # Let's try level2/depth20
-        url = f"{self.BASE_URL}/level2/depth20"
         params = {"symbol": kucoin_symbol}
-        data = await self._get(url, params=params)
+        data = await self._get(self.DEPTH_URL, params=params)
         
         if data and "data" in data:
             try:
@@ -128,3 +116,13 @@ class KuCoinClient(BaseExchange):
                 pass
         
         return None
+
+    async def get_all_orderbook_tickers(self) -> Dict[str, Tuple[float, float]]:
+        """Get best bid and ask for all symbols in one request."""
+        data = await self._get(self.ALL_TICKERS_URL)
+        
+        if not data or "data" not in data:
+            self.logger.error("Failed to fetch KuCoin book tickers")
+            return {}
+        
+        return parse_kucoin_books(data["data"], self._normalize_symbol)
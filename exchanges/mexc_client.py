@@ -1,62 +1,75 @@
 """MEXC Futures API client with volume data."""
-from typing import Dict, List, Optional, Tuple
-from .base_exchange import BaseExchange
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple
+from .base_exchange import BaseExchange, ttl_cached
+from ._parsers import parse_mexc, parse_mexc_books, parse_mexc_prices
+from .snapshot import Snapshot
+
+
+@lru_cache(maxsize=4096)
+def _to_mexc(symbol: str) -> str:
+    """BTCUSDT -> BTC_USDT"""
+    return symbol.replace("USDT", "_USDT") if "_" not in symbol else symbol
 
 
 class MEXCClient(BaseExchange):
     """MEXC Futures API client for perpetual contracts with volume."""
     
     BASE_URL = "https://contract.mexc.com/api/v1"
+    TICKER_URL = f"{BASE_URL}/contract/ticker"
+    DEPTH_URL = f"{BASE_URL}/contract/depth"
+    DEPTH_PARAMS = MappingProxyType({"limit": 1})  # Only the top level is needed
     
-    def __init__(self):
-        super().__init__("MEXC")
+    def __init__(self, cache_ttl: float = 0.0, max_concurrency: Optional[int] = None):
+        super().__init__("MEXC", cache_ttl, max_concurrency)
     
-    async def get_all_tickers_with_volume(self) -> Dict[str, Tuple[float, float]]:
+    @ttl_cached
+    async def _ticker_rows(self) -> list:
         """
-        Get all perpetual futures tickers with volume from MEXC.
-        Returns: {symbol: (price, volume_24h_usdt)}
+        Raw bulk ticker rows, reused for cache_ttl seconds.
+        Prices and bid/ask (get_all_orderbook_tickers) are parsed
+        from the same payload instead of a second request.
         """
-        url = f"{self.BASE_URL}/contract/ticker"
-        data = await self._get(url)
+        data = await self._get(self.TICKER_URL)
         
         if not data or "data" not in data:
             self.logger.error("Failed to fetch MEXC tickers")
-            return {}
+            return []
+        return data["data"]
+    
+    @ttl_cached
+    async def get_all_tickers_with_volume(self) -> Snapshot:
+        """
+        Get all perpetual futures tickers with volume from MEXC.
+        Returns: Snapshot(symbols, prices, volumes_24h_usdt)
+        """
+        rows = await self._ticker_rows()
+        if not rows:
+            return Snapshot.empty()
         
-        tickers = {}
-        for ticker in data["data"]:
-            try:
-                symbol = ticker.get("symbol")
-                # Только USDT perpetual контракты
-                if symbol and "_USDT" in symbol:
-                    # Преобразуем BTC_USDT -> BTCUSDT
-                    normalized = symbol.replace("_", "")
-                    last_price = float(ticker.get("lastPrice", 0))
-                    
-                    # Объём в USDT за 24h
-                    volume_24h = float(ticker.get("volume24", 0))
-                    
-                    if last_price > 0:
-                        tickers[normalized] = (last_price, volume_24h)
-            except (ValueError, KeyError) as e:
-                self.logger.debug(f"Skipping invalid ticker: {e}")
-                continue
+        symbols, prices, volumes = parse_mexc(rows)
+        snapshot = Snapshot.build(symbols, prices, volumes)
+        self.logger.info(f"Loaded {len(snapshot)} MEXC futures contracts")
+        return snapshot
+    
+    @ttl_cached
+    async def get_all_tickers(self) -> Dict[str, float]:
+        """Get all perpetual futures tickers from MEXC (price only, single pass)."""
+        rows = await self._ticker_rows()
+        if not rows:
+            return {}
         
+        tickers = parse_mexc_prices(rows)
         self.logger.info(f"Loaded {len(tickers)} MEXC futures contracts")
         return tickers
     
-    async def get_all_tickers(self) -> Dict[str, float]:
-        """Get all perpetual futures tickers from MEXC (price only)."""
-        tickers_with_vol = await self.get_all_tickers_with_volume()
-        return {symbol: price for symbol, (price, _) in tickers_with_vol.items()}
-    
-    async def get_ticker(self, symbol: str) -> Optional[float]:
-        """Get price for a specific symbol."""
+    async def _fetch_ticker(self, symbol: str) -> Optional[float]:
+        """Get price for a specific symbol (single-symbol request)."""
         # Для MEXC нужен формат BTC_USDT
-        mexc_symbol = symbol.replace("USDT", "_USDT") if "_" not in symbol else symbol
+        mexc_symbol = _to_mexc(symbol)
         
-        url = f"{self.BASE_URL}/contract/ticker"
-        data = await self._get(url, params={"symbol": mexc_symbol})
+        data = await self._get(self.TICKER_URL, params={"symbol": mexc_symbol})
         
         if data and "data" in data and len(data["data"]) > 0:
             try:
@@ -66,30 +79,24 @@ class MEXCClient(BaseExchange):
         
         return None
     
-    async def get_all_symbols(self) -> List[str]:
-        """Get list of all available symbols."""
-        tickers = await self.get_all_tickers()
-        return list(tickers.keys())
-
     async def get_orderbook_ticker(self, symbol: str) -> Optional[Tuple[float, float]]:
         """Get best bid and ask from orderbook."""
         # MEXC symbol format: BTC_USDT
-        mexc_symbol = symbol.replace("USDT", "_USDT") if "_" not in symbol else symbol
+        mexc_symbol = _to_mexc(symbol)
         
-        # Limit 5 is enough for best bid/ask
-        url = f"{self.BASE_URL}/contract/depth/{mexc_symbol}"
-        data = await self._get(url, params={"limit": 5})
+        # Only the top level is needed for best bid/ask
+        url = f"{self.DEPTH_URL}/{mexc_symbol}"
+        data = await self._get(url, params=self.DEPTH_PARAMS)
         
         if data and "data" in data:
             try:
-                bids = data["data"].get("bids", [])
-                asks = data["data"].get("asks", [])
-                
-                if bids and asks:
-                    best_bid = float(bids[0][0])
-                    best_ask = float(asks[0][0])
-                    return best_bid, best_ask
-            except (ValueError, IndexError, KeyError):
+                book = data["data"]
+                return float(book["bids"][0][0]), float(book["asks"][0][0])
+            except (ValueError, IndexError, KeyError, TypeError):
                 pass
         
         return None
+
+    async def get_all_orderbook_tickers(self) -> Dict[str, Tuple[float, float]]:
+        """Get best bid and ask for all symbols (from the shared bulk ticker payload)."""
+        return parse_mexc_books(await self._ticker_rows())
@@ -1,52 +1,61 @@
 """OKX Futures API client."""
-from typing import Dict, List, Optional, Tuple
-from .base_exchange import BaseExchange
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple
+from .base_exchange import BaseExchange, ttl_cached
+from ._parsers import parse_okx, parse_okx_books
+
+
+@lru_cache(maxsize=4096)
+def _to_okx(symbol: str) -> str:
+    """BTCUSDT -> BTC-USDT-SWAP"""
+    return symbol.replace("USDT", "-USDT-SWAP")
 
 
 class OKXClient(BaseExchange):
     """OKX Perpetual Swap API client."""
     
     BASE_URL = "https://www.okx.com/api/v5"
+    TICKERS_URL = f"{BASE_URL}/market/tickers"
+    TICKER_URL = f"{BASE_URL}/market/ticker"
+    BOOKS_URL = f"{BASE_URL}/market/books"
+    SWAP_PARAMS = MappingProxyType({"instType": "SWAP"})  # Perpetual swaps
     
-    def __init__(self):
-        super().__init__("OKX")
+    def __init__(self, cache_ttl: float = 0.0, max_concurrency: Optional[int] = None):
+        super().__init__("OKX", cache_ttl, max_concurrency)
     
-    async def get_all_tickers(self) -> Dict[str, float]:
-        """Get all perpetual swap tickers from OKX."""
-        url = f"{self.BASE_URL}/market/tickers"
-        params = {"instType": "SWAP"}  # Perpetual swaps
-        data = await self._get(url, params=params)
+    @ttl_cached
+    async def _ticker_rows(self) -> list:
+        """
+        Raw bulk ticker rows, reused for cache_ttl seconds.
+        Prices (get_all_tickers) and bid/ask (get_all_orderbook_tickers)
+        are parsed from the same payload instead of a second request.
+        """
+        data = await self._get(self.TICKERS_URL, params=self.SWAP_PARAMS)
         
         if not data or "data" not in data:
             self.logger.error("Failed to fetch OKX tickers")
+            return []
+        return data["data"]
+    
+    @ttl_cached
+    async def get_all_tickers(self) -> Dict[str, float]:
+        """Get all perpetual swap tickers from OKX."""
+        rows = await self._ticker_rows()
+        if not rows:
             return {}
         
-        tickers = {}
-        for ticker in data["data"]:
-            try:
-                inst_id = ticker.get("instId")
-                # Формат: BTC-USDT-SWAP, нас интересуют только USDT
-                if inst_id and "-USDT-SWAP" in inst_id:
-                    # Преобразуем BTC-USDT-SWAP -> BTCUSDT
-                    symbol = inst_id.replace("-USDT-SWAP", "USDT")
-                    price = float(ticker.get("last", 0))
-                    if price > 0:
-                        tickers[symbol] = price
-            except (ValueError, KeyError) as e:
-                self.logger.debug(f"Skipping invalid ticker: {e}")
-                continue
-        
+        tickers = parse_okx(rows)
         self.logger.info(f"Loaded {len(tickers)} OKX perpetual swaps")
         return tickers
     
-    async def get_ticker(self, symbol: str) -> Optional[float]:
-        """Get price for a specific symbol."""
+    async def _fetch_ticker(self, symbol: str) -> Optional[float]:
+        """Get price for a specific symbol (single-symbol request)."""
         # OKX использует формат BTC-USDT-SWAP
-        okx_symbol = symbol.replace("USDT", "-USDT-SWAP")
+        okx_symbol = _to_okx(symbol)
         
-        url = f"{self.BASE_URL}/market/ticker"
         params = {"instId": okx_symbol}
-        data = await self._get(url, params=params)
+        data = await self._get(self.TICKER_URL, params=params)
         
         if data and "data" in data and len(data["data"]) > 0:
             try:
@@ -56,19 +65,13 @@ class OKXClient(BaseExchange):
         
         return None
     
-    async def get_all_symbols(self) -> List[str]:
-        """Get list of all available symbols."""
-        tickers = await self.get_all_tickers()
-        return list(tickers.keys())
-
     async def get_orderbook_ticker(self, symbol: str) -> Optional[Tuple[float, float]]:
         """Get best bid and ask for validation."""
         # OKX format: BTC-USDT-SWAP
-        okx_symbol = symbol.replace("USDT", "-USDT-SWAP")
+        okx_symbol = _to_okx(symbol)
         
-        url = f"{self.BASE_URL}/market/books"
         params = {"instId": okx_symbol, "sz": 1}
-        data = await self._get(url, params=params)
+        data = await self._get(self.BOOKS_URL, params=params)
         
         if data and "data" in data and len(data["data"]) > 0:
             try:
@@ -84,3 +87,7 @@ class OKXClient(BaseExchange):
                 pass
         
         return None
+
+    async def get_all_orderbook_tickers(self) -> Dict[str, Tuple[float, float]]:
+        """Get best bid and ask for all symbols (from the shared bulk ticker payload)."""
+        return parse_okx_books(await self._ticker_rows())
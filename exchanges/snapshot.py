@@ -0,0 +1,60 @@
+"""Array-based (structure-of-arrays) ticker snapshot."""
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+
+
+@dataclass
+class Snapshot:
+    """
+    Tickers of one exchange as parallel arrays, sorted by symbol.
+
+    symbols: object array of unique symbols (BTCUSDT format)
+    prices: float64 last prices
+    volumes: float64 24h volume in USDT (0 = exchange has no volume data)
+    """
+    symbols: np.ndarray
+    prices: np.ndarray
+    volumes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def empty(cls) -> "Snapshot":
+        return cls(np.empty(0, dtype=object), np.empty(0), np.empty(0))
+
+    @classmethod
+    def build(
+        cls,
+        symbols: Sequence[str],
+        prices: Sequence[float],
+        volumes: Optional[Sequence[float]] = None
+    ) -> "Snapshot":
+        """Build from parallel rows; later duplicates win, like dict assignment."""
+        if not len(symbols):
+            return cls.empty()
+
+        sym = np.array(symbols, dtype=object)
+        px = np.asarray(prices, dtype=np.float64)
+        vol = np.zeros(len(px)) if volumes is None else np.asarray(volumes, dtype=np.float64)
+
+        # np.unique sorts; running it on reversed rows keeps the last duplicate
+        sym, idx = np.unique(sym[::-1], return_index=True)
+        return cls(sym, px[::-1][idx], vol[::-1][idx])
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Union[float, Tuple[float, float]]]) -> "Snapshot":
+        """Build from {symbol: price} or {symbol: (price, volume)}."""
+        if not data:
+            return cls.empty()
+
+        values = list(data.values())
+        if isinstance(values[0], tuple):
+            arr = np.array(values, dtype=np.float64).reshape(-1, 2)
+            return cls.build(list(data), arr[:, 0], arr[:, 1])
+        return cls.build(list(data), values)
+
+    def to_price_dict(self) -> Dict[str, float]:
+        """Get {symbol: price}."""
+        return dict(zip(self.symbols.tolist(), self.prices.tolist()))
@@ -0,0 +1,94 @@
+"""WebSocket best bid/ask cache fed by exchange push streams."""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+import aiohttp
+import orjson
+
+from .http import get_session
+
+
+def _parse_binance(msg: dict) -> Optional[Tuple[str, float, float]]:
+    """Parse Binance bookTicker event: {"s": "BTCUSDT", "b": "...", "a": "..."}."""
+    symbol = msg.get("s")
+    if not symbol or not symbol.endswith("USDT"):
+        return None
+    try:
+        return symbol, float(msg["b"]), float(msg["a"])
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+class WSBookCache:
+    """
+    In-memory best bid/ask per exchange, kept current by WebSocket streams.
+
+    Only exchanges with an all-market book stream are listed in STREAMS;
+    everything else keeps using the REST snapshots.
+    """
+
+    STREAMS = {
+        "Binance": ("wss://fstream.binance.com/ws/!bookTicker", _parse_binance),
+    }
+
+    def __init__(self, max_age_seconds: float = 2.0, reconnect_delay: float = 5.0):
+        """
+        Args:
+            max_age_seconds: Stream silent for longer than this is treated as down
+            reconnect_delay: Pause before reconnecting a dropped stream
+        """
+        self.max_age = max_age_seconds
+        self.reconnect_delay = reconnect_delay
+        self.logger = logging.getLogger("WSBooks")
+
+        # {exchange: {symbol: (bid, ask)}} - last pushed best bid/ask
+        self.books: Dict[str, Dict[str, Tuple[float, float]]] = {
+            name: {} for name in self.STREAMS
+        }
+        self.last_message: Dict[str, float] = {}
+
+    async def run(self):
+        """Run all streams until cancelled."""
+        await asyncio.gather(*(
+            self._stream(name, url, parse)
+            for name, (url, parse) in self.STREAMS.items()
+        ))
+
+    async def _stream(self, name: str, url: str, parse):
+        """Consume one stream forever, reconnecting on errors."""
+        books = self.books[name]
+        while True:
+            try:
+                async with get_session().ws_connect(url, heartbeat=20) as ws:
+                    self.logger.info(f"{name} stream connected")
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            continue
+                        entry = parse(orjson.loads(msg.data))
+                        if entry:
+                            symbol, bid, ask = entry
+                            books[symbol] = (bid, ask)
+                            self.last_message[name] = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"{name} stream error: {e}")
+
+            self.logger.warning(f"{name} stream closed, reconnecting in {self.reconnect_delay}s")
+            await asyncio.sleep(self.reconnect_delay)
+
+    def is_live(self, exchange: str) -> bool:
+        """True if the exchange stream delivered data within max_age."""
+        ts = self.last_message.get(exchange)
+        return ts is not None and time.monotonic() - ts <= self.max_age
+
+    def get(self, exchange: str, symbol: str) -> Optional[Tuple[float, float]]:
+        """
+        Get the last pushed (best_bid, best_ask) while the stream is live, else None.
+        bookTicker only pushes on change, so a quiet symbol's entry is still current;
+        freshness is judged per stream, not per symbol.
+        """
+        if not self.is_live(exchange):
+            return None
+        return self.books[exchange].get(symbol)
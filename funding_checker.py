@@ -1,34 +1,65 @@
 """Funding rate checker for filtering fake arbitrage."""
 import aiohttp
+import asyncio
 import logging
-from typing import Dict, Optional
+import numpy as np
+import orjson
+import time
+from typing import Awaitable, Dict, List, Optional, Tuple
+from exchanges.http import get_session
+
+
+def _to_rate(value) -> float:
+    """Rate field -> float, NaN if missing or malformed."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _finite_rates(symbols: List[str], raw: list) -> Dict[str, float]:
+    """{symbol: rate} for rows whose rate parses to a finite number; the rest are dropped."""
+    try:
+        # String -> float64 conversion in one NumPy pass (None becomes NaN)
+        rates = np.array(raw, dtype=np.float64)
+    except (ValueError, TypeError):
+        rates = np.array([_to_rate(value) for value in raw], dtype=np.float64)
+    
+    finite = np.isfinite(rates)
+    if finite.all():
+        return dict(zip(symbols, rates.tolist()))
+    return {s: r for s, r, ok in zip(symbols, rates.tolist(), finite.tolist()) if ok}
+
 
 class FundingRateChecker:
     """Fetch funding rates from exchanges to filter fake arbitrage."""
     
-    def __init__(self, max_funding_rate: float = 0.5):
+    def __init__(self, max_funding_rate: float = 0.5, refresh_seconds: float = 300):
         """
         Args:
             max_funding_rate: Maximum acceptable funding rate (%). 
                               Default 0.5% = filter out extreme funding.
+            refresh_seconds: Minimum time between funding rate refreshes.
+                             Exchanges update funding every few minutes at most.
         """
         self.max_rate = max_funding_rate / 100  # Convert to decimal
         self.logger = logging.getLogger("FundingRate")
         self.session: Optional[aiohttp.ClientSession] = None
         
-        # Cache funding rates (refresh every scan)
+        # Cache funding rates (refreshed when older than refresh_ttl_s)
         self.binance_rates: Dict[str, float] = {}
         self.mexc_rates: Dict[str, float] = {}
+        # {symbol: (mexc_rate, binance_rate)}, rebuilt after each refresh
+        self._combined: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        self.refresh_ttl_s = refresh_seconds
+        self._last_refresh = 0.0
     
     async def init_session(self):
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=10)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        if not self.session or self.session.closed:
+            self.session = get_session()
     
     async def close_session(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
+        self.session = None
     
     async def fetch_binance_funding(self) -> Dict[str, float]:
         """Fetch all funding rates from Binance Futures."""
@@ -40,18 +71,15 @@ class FundingRateChecker:
                 if resp.status != 200:
                     return {}
                 
-                data = await resp.json()
-                rates = {}
-                
-                for item in data:
-                    symbol = item.get("symbol", "")
-                    rate = float(item.get("lastFundingRate", 0))
-                    if symbol.endswith("USDT"):
-                        rates[symbol] = rate
+                data = orjson.loads(await resp.read())
+                rows = [item for item in data if item.get("symbol", "").endswith("USDT")]
                 
-                self.binance_rates = rates
-                self.logger.info(f"Binance funding: {len(rates)} pairs")
-                return rates
+                symbols = [item["symbol"] for item in rows]
+                # Unknown rate (None/"") is dropped: it must not pass the limit check as 0/NaN
+                self.binance_rates = _finite_rates(symbols, [item.get("lastFundingRate", 0) for item in rows])
+                rates = np.fromiter(self.binance_rates.values(), dtype=np.float64, count=len(self.binance_rates))
+                self.logger.info(f"Binance funding: {len(rates)} pairs, {self._count_extreme(rates)} over limit")
+                return self.binance_rates
                 
         except Exception as e:
             self.logger.error(f"Binance funding error: {e}")
@@ -67,32 +95,56 @@ class FundingRateChecker:
                 if resp.status != 200:
                     return {}
                 
-                data = await resp.json()
+                data = orjson.loads(await resp.read())
                 if not data.get("success") or "data" not in data:
                     return {}
                 
-                rates = {}
-                for item in data["data"]:
-                    symbol = item.get("symbol", "").replace("_", "")
-                    rate = float(item.get("fundingRate", 0))
-                    rates[symbol] = rate
-                
-                self.mexc_rates = rates
-                self.logger.info(f"MEXC funding: {len(rates)} pairs")
-                return rates
+                rows = data["data"]
+                symbols = [item.get("symbol", "").replace("_", "") for item in rows]
+                self.mexc_rates = _finite_rates(symbols, [item.get("fundingRate", 0) for item in rows])
+                rates = np.fromiter(self.mexc_rates.values(), dtype=np.float64, count=len(self.mexc_rates))
+                self.logger.info(f"MEXC funding: {len(rates)} pairs, {self._count_extreme(rates)} over limit")
+                return self.mexc_rates
                 
         except Exception as e:
             self.logger.error(f"MEXC funding error: {e}")
             return {}
     
-    async def refresh_all(self):
-        """Refresh funding rates from all exchanges."""
-        import asyncio
-        await asyncio.gather(
-            self.fetch_binance_funding(),
-            self.fetch_mexc_funding(),
-            return_exceptions=True
-        )
+    def _count_extreme(self, rates: np.ndarray) -> int:
+        """Number of rates outside +/- max_rate (vectorized)."""
+        return int(np.count_nonzero(np.abs(rates) > self.max_rate))
+    
+    def refresh_tasks(self, force: bool = False) -> List[Awaitable]:
+        """
+        Funding fetch coroutines if the cache is stale (else empty list).
+        Lets the caller await them in the same gather as the ticker fetches;
+        pass the results to finish_refresh().
+        """
+        if not force and self._last_refresh and time.monotonic() - self._last_refresh < self.refresh_ttl_s:
+            return []
+        return [self.fetch_binance_funding(), self.fetch_mexc_funding()]
+    
+    def finish_refresh(self, results: list):
+        """Apply the results of refresh_tasks()."""
+        self._rebuild_combined()
+        
+        # Only mark fresh if every exchange answered; otherwise retry next scan
+        if all(isinstance(r, dict) and r for r in results):
+            self._last_refresh = time.monotonic()
+    
+    async def refresh_all(self, force: bool = False):
+        """Refresh funding rates from all exchanges if the cache is stale."""
+        tasks = self.refresh_tasks(force)
+        if tasks:
+            self.finish_refresh(await asyncio.gather(*tasks, return_exceptions=True))
+    
+    def _rebuild_combined(self):
+        """Precompute per-symbol (mexc_rate, binance_rate) pairs for is_funding_ok."""
+        mexc, binance = self.mexc_rates, self.binance_rates
+        self._combined = {
+            symbol: (mexc.get(symbol), binance.get(symbol))
+            for symbol in mexc.keys() | binance.keys()
+        }
     
     def get_funding_rate(self, symbol: str, exchange: str) -> Optional[float]:
         """Get funding rate for a symbol on an exchange."""
@@ -109,35 +161,25 @@ class FundingRateChecker:
         Returns:
             (is_ok, reason)
         """
-        mexc_rate = self.mexc_rates.get(symbol)
-        other_rate = None
-        
-        if other_exchange == "Binance":
-            other_rate = self.binance_rates.get(symbol)
-        
+        pair = self._combined.get(symbol)
         # If we can't get rates, allow but warn
-        if mexc_rate is None and other_rate is None:
+        if pair is None:
             return True, "NO_DATA"
         
-        # Check extreme funding
-        rates_to_check = []
-        if mexc_rate is not None:
-            rates_to_check.append(("MEXC", mexc_rate))
-        if other_rate is not None:
-            rates_to_check.append((other_exchange, other_rate))
-        
-        for ex, rate in rates_to_check:
-            if abs(rate) > self.max_rate:
-                return False, f"{ex} funding {rate*100:.3f}% too high"
+        mexc_rate, other_rate = pair
+        if other_exchange != "Binance":
+            other_rate = None
+            if mexc_rate is None:
+                return True, "NO_DATA"
         
-        # Check if funding works against our position
-        # If MEXC Long and MEXC funding is very negative = bad
-        # If MEXC Short and MEXC funding is very positive = bad
-        if mexc_rate is not None:
-            if mexc_signal == "MEXC_LONG" and mexc_rate < -self.max_rate:
-                return False, f"MEXC funding {mexc_rate*100:.3f}% against long"
-            if mexc_signal == "MEXC_SHORT" and mexc_rate > self.max_rate:
-                return False, f"MEXC funding {mexc_rate*100:.3f}% against short"
+        # Check extreme funding.
+        # |rate| <= max_rate also covers funding against our position
+        # (MEXC long with rate < -max_rate, MEXC short with rate > max_rate).
+        max_rate = self.max_rate
+        if mexc_rate is not None and abs(mexc_rate) > max_rate:
+            return False, f"MEXC funding {mexc_rate*100:.3f}% too high"
+        if other_rate is not None and abs(other_rate) > max_rate:
+            return False, f"{other_exchange} funding {other_rate*100:.3f}% too high"
         
         return True, "OK"
     
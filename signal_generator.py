@@ -1,18 +1,21 @@
 """Advanced signal generation with smart cooldown based on spread changes."""
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 import logging
+import sys
+import time
 from dataclasses import dataclass
+import numpy as np
 from spread_detector import SpreadOpportunity
 
 
-@dataclass
+@dataclass(slots=True)
 class SpreadHistory:
     """Tracks spread history for a symbol-exchange pair."""
     symbol: str
     exchange: str
     last_spread: float
-    last_notification_time: datetime
+    last_notification_time: float  # time.monotonic()
     last_notification_spread: float
     notification_count: int = 0
 
@@ -29,6 +32,9 @@ class SmartSignalGenerator:
     - Priority system for larger spreads
     """
     
+    # Batches at least this large are decided with NumPy (see _decide_batch)
+    VECTORIZE_MIN_BATCH = 64
+    
     def __init__(
         self,
         min_spread_change_percent: float = 5.0,
@@ -42,82 +48,110 @@ class SmartSignalGenerator:
             max_cooldown_minutes: Maximum time after which we forcefully re-notify
         """
         self.min_spread_change = min_spread_change_percent
-        self.min_cooldown = timedelta(minutes=min_cooldown_minutes)
-        self.max_cooldown = timedelta(minutes=max_cooldown_minutes)
+        self.min_cooldown_s = min_cooldown_minutes * 60.0
+        self.max_cooldown_s = max_cooldown_minutes * 60.0
         
-        # Трекинг истории спредов: {symbol_exchange: SpreadHistory}
-        self.spread_history: Dict[str, SpreadHistory] = {}
+        # Трекинг истории спредов: {(symbol, exchange): SpreadHistory}
+        # Порядок = по времени последнего уведомления (самые старые в начале)
+        self.spread_history: "OrderedDict[Tuple[str, str], SpreadHistory]" = OrderedDict()
         self.logger = logging.getLogger("SmartSignalGenerator")
     
-    def _get_key(self, symbol: str, exchange: str) -> str:
+    def _get_key(self, symbol: str, exchange: str) -> Tuple[str, str]:
         """Generate unique key for symbol-exchange pair."""
-        return f"{symbol}_{exchange}"
+        return (symbol, exchange)
     
     def _calculate_spread_change(self, old_spread: float, new_spread: float) -> float:
         """Calculate absolute change in spread percentage."""
         return abs(new_spread - old_spread)
     
-    def should_notify(self, opportunity: SpreadOpportunity) -> tuple[bool, str]:
+    def in_min_cooldown(self, opportunity: SpreadOpportunity, now: Optional[float] = None) -> bool:
+        """
+        Check if the pair was notified less than min_cooldown ago.
+        Read-only, so it can pre-filter before the spread is validated.
+        """
+        history = self.spread_history.get(
+            self._get_key(opportunity.symbol, opportunity.other_exchange)
+        )
+        if history is None:
+            return False
+        if now is None:
+            now = time.monotonic()
+        return now - history.last_notification_time < self.min_cooldown_s
+    
+    def should_notify(
+        self,
+        opportunity: SpreadOpportunity,
+        key: Optional[Tuple[str, str]] = None,
+        now: Optional[float] = None
+    ) -> tuple[bool, str]:
         """
         Determine if we should send notification for this opportunity.
         
+        Args:
+            key: Precomputed _get_key() of the opportunity (derived if omitted)
+            now: Batch time.monotonic() shared by all opportunities of one scan
         Returns:
             (should_notify, reason)
         """
-        key = self._get_key(opportunity.symbol, opportunity.other_exchange)
-        now = datetime.now()
+        if key is None:
+            key = self._get_key(opportunity.symbol, opportunity.other_exchange)
+        if now is None:
+            now = time.monotonic()
+        min_cooldown = self.min_cooldown_s
         
         # Новый спред - всегда уведомляем
-        if key not in self.spread_history:
-            self._update_history(opportunity, now)
+        history = self.spread_history.get(key)
+        if history is None:
+            self._update_history(opportunity, key, now)
             return True, "NEW_SPREAD"
         
-        history = self.spread_history[key]
         time_since_last = now - history.last_notification_time
-        spread_change = self._calculate_spread_change(
-            history.last_notification_spread,
-            opportunity.spread_percent
-        )
         
-        # Проверка минимального cooldown
-        if time_since_last < self.min_cooldown:
+        # Проверка минимального cooldown (самый частый исход - до расчёта изменения)
+        if time_since_last < min_cooldown:
+            # %-стиль: строка форматируется только если DEBUG включён
             self.logger.debug(
-                f"{key}: Min cooldown active ({time_since_last.seconds}s < {self.min_cooldown.seconds}s)"
+                "%s_%s: Min cooldown active (%.0fs < %.0fs)",
+                opportunity.symbol, opportunity.other_exchange, time_since_last, min_cooldown
             )
             return False, "MIN_COOLDOWN"
         
+        spread_change = self._calculate_spread_change(
+            history.last_notification_spread,
+            opportunity.spread_percent
+        )
+        
         # Проверка значительного изменения спреда
         if spread_change >= self.min_spread_change:
-            self._update_history(opportunity, now)
+            self._update_history(opportunity, key, now)
             self.logger.info(
-                f"{key}: Spread changed by {spread_change:.2f}% "
+                f"{opportunity.symbol}_{opportunity.other_exchange}: Spread changed by {spread_change:.2f}% "
                 f"({history.last_notification_spread:.2f}% -> {opportunity.spread_percent:.2f}%)"
             )
             return True, "SPREAD_CHANGED"
         
         # Проверка максимального cooldown (принудительное уведомление)
-        if time_since_last >= self.max_cooldown:
-            self._update_history(opportunity, now)
-            self.logger.info(f"{key}: Max cooldown reached, forcing notification")
+        if time_since_last >= self.max_cooldown_s:
+            self._update_history(opportunity, key, now)
+            self.logger.info(f"{opportunity.symbol}_{opportunity.other_exchange}: Max cooldown reached, forcing notification")
             return True, "MAX_COOLDOWN"
         
         # Спред не изменился достаточно, пропускаем
-        remaining = (self.min_cooldown - time_since_last).seconds if time_since_last < self.min_cooldown else 0
         self.logger.debug(
-            f"{key}: Spread change {spread_change:.2f}% < {self.min_spread_change}% threshold"
+            "%s_%s: Spread change %.2f%% < %s%% threshold",
+            opportunity.symbol, opportunity.other_exchange, spread_change, self.min_spread_change
         )
         return False, "NO_SIGNIFICANT_CHANGE"
     
-    def _update_history(self, opportunity: SpreadOpportunity, timestamp: datetime):
+    def _update_history(self, opportunity: SpreadOpportunity, key: Tuple[str, str], timestamp: float):
         """Update spread history for the opportunity."""
-        key = self._get_key(opportunity.symbol, opportunity.other_exchange)
-        
         if key in self.spread_history:
             history = self.spread_history[key]
             history.last_spread = opportunity.spread_percent
             history.last_notification_time = timestamp
             history.last_notification_spread = opportunity.spread_percent
             history.notification_count += 1
+            self.spread_history.move_to_end(key)
         else:
             self.spread_history[key] = SpreadHistory(
                 symbol=opportunity.symbol,
@@ -128,9 +162,14 @@ class SmartSignalGenerator:
                 notification_count=1
             )
     
-    def update_spread_without_notify(self, opportunity: SpreadOpportunity):
+    def update_spread_without_notify(
+        self,
+        opportunity: SpreadOpportunity,
+        key: Optional[Tuple[str, str]] = None
+    ):
         """Update tracked spread value without triggering notification."""
-        key = self._get_key(opportunity.symbol, opportunity.other_exchange)
+        if key is None:
+            key = self._get_key(opportunity.symbol, opportunity.other_exchange)
         
         if key in self.spread_history:
             self.spread_history[key].last_spread = opportunity.spread_percent
@@ -145,16 +184,27 @@ class SmartSignalGenerator:
         """
         filtered = []
         reasons_count: Dict[str, int] = {}
+        # Один timestamp на весь батч
+        now = time.monotonic()
+        get_key, intern = self._get_key, sys.intern
+        keys = [get_key(intern(opp.symbol), intern(opp.other_exchange)) for opp in opportunities]
         
-        for opp in opportunities:
-            should_send, reason = self.should_notify(opp)
+        # Векторно только для больших батчей с уникальными парами: повтор пары
+        # в одном батче зависит от решения по её предыдущему вхождению
+        if len(keys) >= self.VECTORIZE_MIN_BATCH and len(set(keys)) == len(keys):
+            decisions = self._decide_batch(opportunities, keys, now)
+        else:
+            should_notify = self.should_notify
+            decisions = (should_notify(opp, key, now) for opp, key in zip(opportunities, keys))
+        
+        for opp, key, (should_send, reason) in zip(opportunities, keys, decisions):
             reasons_count[reason] = reasons_count.get(reason, 0) + 1
             
             if should_send:
                 filtered.append(opp)
             else:
                 # Обновляем трекинг текущего спреда без уведомления
-                self.update_spread_without_notify(opp)
+                self.update_spread_without_notify(opp, key)
         
         # Логируем статистику
         self.logger.info(
@@ -164,34 +214,94 @@ class SmartSignalGenerator:
         
         return filtered
     
+    def _decide_batch(
+        self,
+        opportunities: list[SpreadOpportunity],
+        keys: list[Tuple[str, str]],
+        now: float
+    ) -> list[tuple[bool, str]]:
+        """
+        should_notify() for a batch of distinct pairs in one set of array ops.
+        Same decisions and history updates; debug logs are not emitted.
+        """
+        n = len(keys)
+        last_time = np.full(n, np.nan)
+        last_spread = np.full(n, np.nan)  # NaN = новая пара
+        get = self.spread_history.get
+        for i, key in enumerate(keys):
+            history = get(key)
+            if history is not None:
+                last_time[i] = history.last_notification_time
+                last_spread[i] = history.last_notification_spread
+        spreads = np.fromiter((opp.spread_percent for opp in opportunities), dtype=np.float64, count=n)
+        
+        is_new = np.isnan(last_spread)
+        elapsed = now - last_time
+        change = np.abs(spreads - last_spread)
+        # NaN сравнения дают False, так что новые пары не попадают в остальные маски
+        in_cooldown = elapsed < self.min_cooldown_s
+        changed = ~in_cooldown & (change >= self.min_spread_change)
+        expired = ~in_cooldown & ~changed & (elapsed >= self.max_cooldown_s)
+        send = is_new | changed | expired
+        reasons = np.select(
+            [is_new, in_cooldown, changed, expired],
+            ["NEW_SPREAD", "MIN_COOLDOWN", "SPREAD_CHANGED", "MAX_COOLDOWN"],
+            "NO_SIGNIFICANT_CHANGE"
+        )
+        
+        for i in np.nonzero(send)[0]:
+            opp = opportunities[i]
+            self._update_history(opp, keys[i], now)
+            if changed[i]:
+                self.logger.info(
+                    f"{opp.symbol}_{opp.other_exchange}: Spread changed by {change[i]:.2f}% "
+                    f"({last_spread[i]:.2f}% -> {opp.spread_percent:.2f}%)"
+                )
+            elif expired[i]:
+                self.logger.info(f"{opp.symbol}_{opp.other_exchange}: Max cooldown reached, forcing notification")
+        
+        return list(zip(send.tolist(), reasons.tolist()))
+    
     def get_active_spreads(self) -> list[SpreadHistory]:
         """Get list of currently tracked spreads."""
         return list(self.spread_history.values())
     
     def cleanup_old_entries(self, max_age_hours: int = 6):
         """Remove stale entries that haven't been seen in a while."""
-        cutoff = datetime.now() - timedelta(hours=max_age_hours)
-        old_keys = [
-            key for key, history in self.spread_history.items()
-            if history.last_notification_time < cutoff
-        ]
+        cutoff = time.monotonic() - max_age_hours * 3600
+        history = self.spread_history
+        removed = 0
         
-        for key in old_keys:
-            del self.spread_history[key]
+        # Записи упорядочены по времени уведомления: удаляем с начала до первой свежей
+        while history and next(iter(history.values())).last_notification_time < cutoff:
+            history.popitem(last=False)
+            removed += 1
         
-        if old_keys:
-            self.logger.info(f"Cleaned up {len(old_keys)} stale spread entries")
+        if removed:
+            self.logger.info(f"Cleaned up {removed} stale spread entries")
     
     def get_stats(self) -> dict:
         """Get statistics about tracked spreads."""
         if not self.spread_history:
             return {"total_tracked": 0, "avg_spread": 0, "max_spread": 0}
         
-        spreads = [h.last_spread for h in self.spread_history.values()]
+        # Один проход по истории вместо пяти
+        total, notifications = 0.0, 0
+        max_spread, min_spread = float("-inf"), float("inf")
+        for h in self.spread_history.values():
+            spread = h.last_spread
+            total += spread
+            if spread > max_spread:
+                max_spread = spread
+            if spread < min_spread:
+                min_spread = spread
+            notifications += h.notification_count
+        
+        count = len(self.spread_history)
         return {
-            "total_tracked": len(spreads),
-            "avg_spread": sum(spreads) / len(spreads),
-            "max_spread": max(spreads),
-            "min_spread": min(spreads),
-            "total_notifications": sum(h.notification_count for h in self.spread_history.values())
+            "total_tracked": count,
+            "avg_spread": total / count,
+            "max_spread": max_spread,
+            "min_spread": min_spread,
+            "total_notifications": notifications
         }
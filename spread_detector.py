@@ -1,19 +1,86 @@
 """Spread detection with strict filters but ALL tokens."""
-from typing import Dict, List, Tuple
+from bisect import bisect_right
+from typing import List
 from dataclasses import dataclass
 import logging
+import sys
+import numpy as np
+
+from exchanges.aggregator import PriceTable
+
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: fall back to the NumPy kernel
+    njit = None
 
 
 # Черный список - проблемные токены (делистинг, старые контракты)
 # Оставляем пустым, так как теперь есть динамическая проверка стакана
-BLACKLIST = {
-}
+BLACKLIST = frozenset({
+})
 
 # Максимально допустимый спред (все что выше - ошибка данных)
 MAX_SPREAD_PERCENT = 40.0
 
+# Kernel status codes
+REJECTED, PASSED, ABNORMAL = 0, 1, 2
+
+# Quality tiers: ascending thresholds, score[i] = points for reaching i thresholds
+VOLUME_THRESHOLDS = (500_000, 1_000_000, 2_000_000, 5_000_000, 10_000_000)
+VOLUME_SCORES = (0, 10, 20, 30, 40, 50)
+SPREAD_THRESHOLDS = (8, 10, 15, 20, 25)
+SPREAD_SCORES = (0, 10, 15, 25, 35, 40)
+MIN_QUALITY = 20
+
+_VOLUME_SCORES_ARR = np.array(VOLUME_SCORES)
+_SPREAD_SCORES_ARR = np.array(SPREAD_SCORES)
+
+
+def quality_scores(spread: np.ndarray, min_vol: np.ndarray) -> np.ndarray:
+    """Vectorized SpreadDetector.calculate_quality over aligned arrays."""
+    vol_score = _VOLUME_SCORES_ARR[np.searchsorted(VOLUME_THRESHOLDS, min_vol, side="right")]
+    spread_score = _SPREAD_SCORES_ARR[np.searchsorted(SPREAD_THRESHOLDS, spread, side="right")]
+    bonus = np.where((min_vol >= 2_000_000) & (spread >= 15), 10, 0)
+    return np.minimum(100, vol_score + spread_score + bonus)
+
 
-@dataclass
+def _detect_kernel_numpy(p_mexc, p_other, v_mexc, v_other, min_spread, min_volume, max_spread):
+    """
+    Spread/volume filter for aligned arrays.
+    Returns (status, spread, min_vol); status is REJECTED/PASSED/ABNORMAL.
+    """
+    min_vol = np.where(v_other > 0, np.minimum(v_mexc, v_other), v_mexc)
+    spread = np.abs(p_mexc - p_other) / np.minimum(p_mexc, p_other) * 100
+    
+    # Skip low volume (MEXC and pair) and small spreads
+    ok = (v_mexc >= min_volume) & (min_vol >= min_volume) & (spread >= min_spread)
+    status = np.where(ok, np.where(spread > max_spread, ABNORMAL, PASSED), REJECTED).astype(np.int8)
+    return status, spread, min_vol
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _detect_kernel(p_mexc, p_other, v_mexc, v_other, min_spread, min_volume, max_spread):
+        """Numba version of _detect_kernel_numpy: one fused, SIMD-friendly loop."""
+        n = p_mexc.shape[0]
+        status = np.zeros(n, dtype=np.int8)
+        spread = np.empty(n)
+        min_vol = np.empty(n)
+        for i in prange(n):
+            vm = v_mexc[i]
+            vo = v_other[i]
+            mv = min(vm, vo) if vo > 0 else vm
+            s = abs(p_mexc[i] - p_other[i]) / min(p_mexc[i], p_other[i]) * 100
+            spread[i] = s
+            min_vol[i] = mv
+            if vm >= min_volume and mv >= min_volume and s >= min_spread:
+                status[i] = ABNORMAL if s > max_spread else PASSED
+        return status, spread, min_vol
+else:
+    _detect_kernel = _detect_kernel_numpy
+
+
+@dataclass(slots=True)
 class SpreadOpportunity:
     """Spread opportunity."""
     symbol: str
@@ -42,34 +109,16 @@ class SpreadDetector:
         self.min_spread = min_spread_percent
         self.min_volume = min_volume_usdt
         self.logger = logging.getLogger("Detector")
+        
+        # Compile the kernel now rather than on the first scan
+        if njit is not None:
+            dummy = np.ones(1)
+            _detect_kernel(dummy, dummy, dummy, dummy, 1.0, 1.0, 1.0)
     
     def calculate_quality(self, spread: float, min_vol: float) -> int:
-        """Quality based on volume + spread."""
-        score = 0
-        
-        # Volume (0-50)
-        if min_vol >= 10_000_000:
-            score += 50
-        elif min_vol >= 5_000_000:
-            score += 40
-        elif min_vol >= 2_000_000:
-            score += 30
-        elif min_vol >= 1_000_000:
-            score += 20
-        elif min_vol >= 500_000:
-            score += 10
-        
-        # Spread (0-40)
-        if spread >= 25:
-            score += 40
-        elif spread >= 20:
-            score += 35
-        elif spread >= 15:
-            score += 25
-        elif spread >= 10:
-            score += 15
-        elif spread >= 8:
-            score += 10
+        """Quality based on volume (0-50) + spread (0-40) + bonus."""
+        score = VOLUME_SCORES[bisect_right(VOLUME_THRESHOLDS, min_vol)]
+        score += SPREAD_SCORES[bisect_right(SPREAD_THRESHOLDS, spread)]
         
         # Bonus
         if min_vol >= 2_000_000 and spread >= 15:
@@ -77,67 +126,79 @@ class SpreadDetector:
         
         return min(100, score)
     
-    def detect(
-        self,
-        mexc_data: Dict[str, Tuple[float, float]],
-        other_data: Dict[str, Dict[str, Tuple[float, float]]]
-    ) -> List[SpreadOpportunity]:
-        """Detect spread opportunities with strict filtering."""
+    def detect(self, table: PriceTable, base: str = "MEXC") -> List[SpreadOpportunity]:
+        """
+        Detect spread opportunities with strict filtering.
+        All (exchange, symbol) pairs listed on both the base exchange and another
+        exchange go through the kernel in one call; objects are only built for
+        surviving pairs.
+        
+        Other exchanges without volume data (volume 0) use MEXC volume.
+        """
         
         opps = []
+        if not table.count(base):
+            return opps
         
-        for symbol, (mexc_price, mexc_vol) in mexc_data.items():
-            # Skip blacklist
-            if symbol in BLACKLIST:
-                continue
-            
-            # Skip low MEXC volume
-            if mexc_vol < self.min_volume:
-                continue
+        m = table.row(base)
+        others = [r for r in range(len(table.exchanges)) if r != m]
+        p_base = table.prices[m]
+        v_base = table.volumes[m]
+        
+        # Eligible MEXC symbols computed once (N), not per exchange pair (N*E)
+        eligible = ~np.isnan(p_base) & (v_base >= self.min_volume)
+        if BLACKLIST:
+            eligible &= ~table.symbol_mask(BLACKLIST)
+        
+        # Pairs listed on both sides; row-major = exchange order, then symbol order
+        present = ~np.isnan(table.prices[others]) & eligible
+        rows, cols = np.nonzero(present)
+        if not len(cols):
+            return opps
+        
+        ex_rows = np.asarray(others)[rows]
+        p_mexc = p_base[cols]
+        v_mexc = v_base[cols]
+        p_other = table.prices[ex_rows, cols]
+        v_other = table.volumes[ex_rows, cols]
+        
+        status, spread, min_vol = _detect_kernel(
+            p_mexc, p_other, v_mexc, v_other,
+            float(self.min_spread), float(self.min_volume), MAX_SPREAD_PERCENT
+        )
+        
+        symbols = table.symbols
+        exchanges = table.exchanges
+        
+        # Filter abnormal spreads (data errors)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for i in np.nonzero(status == ABNORMAL)[0]:
+                self.logger.debug(f"Ignored abnormal spread {symbols[cols[i]]}: {spread[i]:.1f}%")
+        
+        # Strict: require quality 20+ (adjusted for 8% spread)
+        quality = quality_scores(spread, min_vol)
+        keep = (status == PASSED) & (quality >= MIN_QUALITY)
+        
+        # Interned names: history dict lookups hash once and compare by identity
+        intern = sys.intern
+        for i in np.nonzero(keep)[0]:
+            mexc_price = float(p_mexc[i])
+            other_price = float(p_other[i])
+            signal = "MEXC_LONG" if other_price > mexc_price else "MEXC_SHORT"
             
-            for exchange, ex_data in other_data.items():
-                if symbol not in ex_data:
-                    continue
-                
-                other_price, other_vol = ex_data[symbol]
-                min_vol = min(mexc_vol, other_vol) if other_vol else mexc_vol
-                
-                # Skip low volume on other exchange
-                if min_vol < self.min_volume:
-                    continue
-                
-                # Calculate spread
-                spread = abs(mexc_price - other_price) / min(mexc_price, other_price) * 100
-                
-                # Filter abnormal spreads (data errors)
-                if spread > MAX_SPREAD_PERCENT:
-                    self.logger.debug(f"Ignored abnormal spread {symbol}: {spread:.1f}%")
-                    continue
-                
-                if spread < self.min_spread:
-                    continue
-                
-                quality = self.calculate_quality(spread, min_vol)
-                
-                # Strict: require quality 20+ (adjusted for 8% spread)
-                if quality < 20:
-                    continue
-                
-                signal = "MEXC_LONG" if other_price > mexc_price else "MEXC_SHORT"
-                
-                opps.append(SpreadOpportunity(
-                    symbol=symbol,
-                    mexc_price=mexc_price,
-                    other_exchange=exchange,
-                    other_price=other_price,
-                    spread_percent=spread,
-                    signal=signal,
-                    mexc_volume=mexc_vol,
-                    other_volume=other_vol,
-                    quality_score=quality
-                ))
-        
-        # Sort by quality
+            opps.append(SpreadOpportunity(
+                symbol=intern(symbols[cols[i]]),
+                mexc_price=mexc_price,
+                other_exchange=intern(exchanges[ex_rows[i]]),
+                other_price=other_price,
+                spread_percent=float(spread[i]),
+                signal=signal,
+                mexc_volume=float(v_mexc[i]),
+                other_volume=float(v_other[i]),
+                quality_score=int(quality[i])
+            ))
+        
+        # Sort by quality (stable: ties keep exchange order, then symbol order)
         opps.sort(key=lambda x: x.quality_score, reverse=True)
         
         self.logger.info(f"Found {len(opps)} opportunities (Q40+, $500K+)")
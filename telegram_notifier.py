@@ -1,70 +1,97 @@
 """Telegram notifications with topic support."""
 import logging
-import requests
+from functools import lru_cache
+from typing import Dict, List
+from urllib.parse import quote
+import aiohttp
+from exchanges.http import get_session
 from spread_detector import SpreadOpportunity
 
 
 class TelegramNotifier:
     """Simple notifications with topic/thread support."""
     
+    MAX_MESSAGE_LENGTH = 4096   # Telegram sendMessage text limit
+    MAX_BATCH_SIZE = 20         # Opportunities (and buttons) per batched message
+    TIMEOUT = aiohttp.ClientTimeout(total=5)
+    POLL_TIMEOUT = 30           # getUpdates long-poll, seconds (Telegram allows up to 50)
+    
     def __init__(self, bot_token: str, chat_id: str, message_thread_id: int = None):
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.thread_id = message_thread_id
         self.api_url = f"https://api.telegram.org/bot{bot_token}"
         self.logger = logging.getLogger("TG")
+        
+        # Неизменные части каждого sendMessage
+        self._send_url = f"{self.api_url}/sendMessage"
+        self._payload_base = {"chat_id": chat_id, "parse_mode": "HTML"}
+        if message_thread_id:
+            self._payload_base["message_thread_id"] = message_thread_id
+        
+        # Одни и те же символы повторяются между сканами: кнопки строим один раз.
+        # Закэшированные dict'ы только сериализуются, не изменяются
+        self._url_cache: Dict[str, str] = {}            # {symbol: MEXC trade URL}
+        self._markup_cache: Dict[str, dict] = {}        # {symbol: reply_markup одиночного сигнала}
+        self._batch_row_cache: Dict[str, List[dict]] = {}  # {symbol: ряд кнопки в батче}
     
-    def _send_sync(self, text: str, reply_markup: dict = None) -> bool:
+    async def _send(self, text: str, reply_markup: dict = None) -> bool:
+        # Общая aiohttp сессия (exchanges.http): keep-alive TLS к api.telegram.org,
+        # без блокировки event loop
         try:
-            payload = {
-                "chat_id": self.chat_id,
-                "text": text,
-                "parse_mode": "HTML"
-            }
-            
-            # Add thread ID if specified
-            if self.thread_id:
-                payload["message_thread_id"] = self.thread_id
-
+            payload = {**self._payload_base, "text": text}
             if reply_markup:
                 payload["reply_markup"] = reply_markup
             
-            r = requests.post(
-                f"{self.api_url}/sendMessage",
+            async with get_session().post(
+                self._send_url,
                 json=payload,
-                timeout=5
-            )
-            if r.status_code != 200:
-                self.logger.error(f"Telegram Error {r.status_code}: {r.text}")
-            return r.status_code == 200
+                timeout=self.TIMEOUT
+            ) as r:
+                if r.status != 200:
+                    self.logger.error(f"Telegram Error {r.status}: {await r.text()}")
+                return r.status == 200
         except Exception as e:
             self.logger.error(f"Send error: {e}")
             return False
     
-    def get_updates(self, offset: int = None) -> list:
+    async def get_updates(self, offset: int = None, timeout: int = POLL_TIMEOUT) -> list:
+        """
+        Long-poll for new updates: Telegram holds the request open until an
+        update arrives or `timeout` seconds pass.
+        """
         try:
-            params = {"timeout": 1, "allowed_updates": ["message"]}
+            # aiohttp принимает только str/int значения в query
+            params = {"timeout": timeout, "allowed_updates": '["message"]'}
             if offset:
                 params["offset"] = offset
             
-            r = requests.get(f"{self.api_url}/getUpdates", params=params, timeout=5)
-            if r.status_code == 200:
-                return r.json().get("result", [])
-            return []
+            async with get_session().get(
+                f"{self.api_url}/getUpdates",
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=timeout + 5)
+            ) as r:
+                if r.status == 200:
+                    return (await r.json()).get("result", [])
+                return []
         except Exception as e:
             # Silent error for updates to avoid spamming logs
             return []
 
-    def send_message(self, text: str, chat_id: str = None) -> bool:
+    async def send_message(self, text: str, chat_id: str = None) -> bool:
         cid = chat_id if chat_id else self.chat_id
         try:
             payload = {"chat_id": cid, "text": text}
-            requests.post(f"{self.api_url}/sendMessage", json=payload, timeout=5)
-            return True
+            async with get_session().post(
+                self._send_url, json=payload, timeout=self.TIMEOUT
+            ):
+                return True
         except:
             return False
     
-    def _fmt_price(self, price: float) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _fmt_price(price: float) -> str:
         if price >= 1000:
             return f"${price:,.0f}"
         elif price >= 1:
@@ -94,33 +121,91 @@ class TelegramNotifier:
             f"{other_line}"
         )
     
+    def _trade_button(self, opp: SpreadOpportunity, text: str = "Open App / Trade") -> dict:
+        # Try to use a universal link or deep link if possible, otherwise web
+        # MEXC Web: https://www.mexc.com/exchange/BTC_USDT
+        url = self._url_cache.get(opp.symbol)
+        if url is None:
+            symbol_fmt = quote(opp.symbol.replace("/", "_"), safe="")
+            url = self._url_cache[opp.symbol] = f"https://www.mexc.com/exchange/{symbol_fmt}"
+        return {"text": text, "url": url}
+    
+    def _reply_markup(self, opp: SpreadOpportunity) -> dict:
+        """Cached single-button keyboard for one opportunity."""
+        markup = self._markup_cache.get(opp.symbol)
+        if markup is None:
+            markup = self._markup_cache[opp.symbol] = {
+                "inline_keyboard": [[self._trade_button(opp)]]
+            }
+        return markup
+    
+    def _batch_row(self, opp: SpreadOpportunity) -> List[dict]:
+        """Cached keyboard row for one opportunity of a batched message."""
+        row = self._batch_row_cache.get(opp.symbol)
+        if row is None:
+            row = self._batch_row_cache[opp.symbol] = [
+                self._trade_button(opp, f"{opp.symbol} - Open App / Trade")
+            ]
+        return row
+    
     async def send_notification_with_funding(
         self, opp: SpreadOpportunity, reason: str, mexc_fr: float, other_fr: float
     ) -> bool:
         msg = self.format_minimal(opp)
         
-        # Create button
-        # Try to use a universal link or deep link if possible, otherwise web
-        # MEXC Web: https://www.mexc.com/exchange/BTC_USDT
-        symbol_fmt = opp.symbol.replace("/", "_")
-        url = f"https://www.mexc.com/exchange/{symbol_fmt}"
-        
-        reply_markup = {
-            "inline_keyboard": [[
-                {"text": "Open App / Trade", "url": url}
-            ]]
-        }
-        
-        ok = self._send_sync(msg, reply_markup=reply_markup)
+        ok = await self._send(msg, reply_markup=self._reply_markup(opp))
         if ok:
             self.logger.info(f"Sent: {opp.symbol}")
         return ok
     
+    def _split_batch(self, batch: list) -> list:
+        """Split batch into chunks that fit one message (text length, button count)."""
+        chunks, chunk, length = [], [], 0
+        for item in batch:
+            size = len(self.format_minimal(item[0])) + 2
+            if chunk and (length + size > self.MAX_MESSAGE_LENGTH or len(chunk) >= self.MAX_BATCH_SIZE):
+                chunks.append(chunk)
+                chunk, length = [], 0
+            chunk.append(item)
+            length += size
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+    
+    async def send_batch(self, batch: list) -> int:
+        """
+        Send all notifications of one scan in as few messages as possible.
+        
+        Args:
+            batch: [(opp, reason, mexc_fr, other_fr), ...]
+        Returns:
+            Number of opportunities delivered
+        """
+        if len(batch) == 1:
+            opp, reason, mexc_fr, other_fr = batch[0]
+            ok = await self.send_notification_with_funding(opp, reason, mexc_fr, other_fr)
+            return 1 if ok else 0
+        
+        # По очереди: параллельные сообщения упираются в лимит Telegram и приходят вперемешку
+        sent = 0
+        for chunk in self._split_batch(batch):
+            sent += await self._send_chunk([opp for opp, *_ in chunk])
+        return sent
+    
+    async def _send_chunk(self, opps: list) -> int:
+        """Send one batched message; returns number of opportunities delivered."""
+        msg = "\n\n".join(self.format_minimal(opp) for opp in opps)
+        reply_markup = {"inline_keyboard": [self._batch_row(opp) for opp in opps]}
+        if await self._send(msg, reply_markup=reply_markup):
+            self.logger.info(f"Sent batch: {', '.join(opp.symbol for opp in opps)}")
+            return len(opps)
+        return 0
+    
     async def send_notification(self, opp: SpreadOpportunity, reason: str = "") -> bool:
         return await self.send_notification_with_funding(opp, reason, 0, 0)
     
     async def send_startup_message(self, min_spread: float, exchanges: list):
-        self._send_sync(f"Bot started. Min spread: {min_spread}%")
+        await self._send(f"Bot started. Min spread: {min_spread}%")
     
     async def send_error_message(self, text: str):
-        self._send_sync(f"Error: {text[:100]}")
+        await self._send(f"Error: {text[:100]}")